@@ -0,0 +1,201 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+from argparse import ArgumentParser
+from asyncio import gather, run, sleep
+from datetime import datetime, timezone
+from json import dump
+from logging import basicConfig, WARNING
+from platform import python_version
+from subprocess import run as run_process
+from tempfile import NamedTemporaryFile
+from os import remove
+from time import perf_counter_ns
+
+from core.bot import CustomBot, CustomContext
+from core.mongo import MongoDBClient
+from benchmarks.fakes import MemoryDatabase, FakeHTTP, FakeRole, FakeMember, FakeChannel, FakeGuild, FakeMessage
+
+from discord.ext import commands
+
+if TYPE_CHECKING:
+    from typing import Any
+
+
+# Usage: python -m benchmarks.dispatch [--iterations 2000] [--concurrency 50] [--output dispatch.json]
+#                                      [--mongo-uri mongodb://localhost:27017]
+# Drives `CustomBot.on_message` end to end with synthetic messages, no gateway and no Discord HTTP.
+# Without --mongo-uri the database is an in-memory stand-in, so timings exclude network round trips.
+
+
+PREFIX = '!'
+GUILD_ID = 1
+HELPER_ROLE_ID = 10
+STAFF_ID, MEMBER_ID, TARGET_ID = 100, 200, 300
+
+
+@commands.command(name='noop', extras={'requirement': 0})
+async def noop(_: CustomContext) -> None:
+    ...
+
+
+@commands.command(name='warn', extras={'requirement': 1})
+async def warn(ctx: CustomContext, user_id: int, *, reason: str = 'No reason provided.') -> None:
+    await ctx.bot.check_target_member(ctx.guild.get_member(user_id) or FakeMember(user_id))
+    modlog = await ctx.to_modlog(user_id, reason=reason)
+    await ctx.bot.mongo.insert_modlog(modlog)
+
+
+SCENARIOS = {
+    'chat': (MEMBER_ID, 'hello everyone, how is it going today?'),
+    'chat_with_link': (MEMBER_ID, 'the docs are at https://docs.python.org/3/library/asyncio.html'),
+    'noop': (MEMBER_ID, f'{PREFIX}noop'),
+    'warn': (STAFF_ID, f'{PREFIX}warn {TARGET_ID} spamming in general'),
+    'warn_denied': (MEMBER_ID, f'{PREFIX}warn {TARGET_ID} spamming in general')
+}
+
+
+def percentile(samples: list[int], fraction: float, /) -> float:
+    return samples[round(fraction * (len(samples) - 1))] / 1000
+
+
+def git_commit() -> str | None:
+    result = run_process(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip()
+
+
+async def prepare(bot: CustomBot, mongo_uri: str | None, journal: str, /) -> MongoDBClient:
+    guild = FakeGuild(GUILD_ID, owner_id=0)
+    for member in (
+        FakeMember(STAFF_ID, roles=[FakeRole(HELPER_ROLE_ID)]),
+        FakeMember(MEMBER_ID),
+        FakeMember(TARGET_ID)
+    ):
+        guild.members[member.id] = member
+
+    # Registered like a gateway guild, so member lookups resolve the same way as in production
+    bot._connection._add_guild(guild)
+    bot.guild_id, bot.guild = GUILD_ID, guild
+    bot.command_prefix = PREFIX
+    bot._connection.user = FakeMember(0, bot=True)
+
+    http = FakeHTTP()
+    bot.http.request = http.request
+    bot.fake_http = http
+
+    if mongo_uri is None:
+        mongo = MongoDBClient(bot, 'mongodb://localhost:27017', tls=False, journal=journal)
+        mongo.database = MemoryDatabase()
+        await mongo.ensure_indexes()
+        await mongo.seed_modlog_counter()
+        await mongo.open_journal()
+    else:
+        mongo = MongoDBClient(bot, mongo_uri, database='benchmark_dispatch', tls=False, journal=journal)
+        await mongo.client.drop_database('benchmark_dispatch')
+        await mongo.__aenter__()
+
+    bot.mongo = mongo
+    bot.metadata = await mongo.get_metadata()
+    await mongo.update_metadata(helper_role_id=HELPER_ROLE_ID)
+
+    bot.add_command(noop)
+    bot.add_command(warn)
+    return mongo
+
+
+async def measure(bot: CustomBot, name: str, iterations: int, concurrency: int, /) -> dict[str, Any]:
+    author_id, content = SCENARIOS[name]
+    author, channel = bot.guild.get_member(author_id), FakeChannel(2)
+
+    def message() -> FakeMessage:
+        return FakeMessage(bot._connection, content, author, channel, bot.guild)
+
+    for _ in range(min(iterations // 10, 200)):
+        await bot.on_message(message())
+    await sleep(0)
+
+    operations_before = sum(getattr(bot.mongo.database, 'operations', {}).values())
+    requests_before = sum(bot.fake_http.requests.values())
+
+    samples = []
+    for n in range(iterations):
+        msg = message()
+        start = perf_counter_ns()
+        await bot.on_message(msg)
+        samples.append(perf_counter_ns() - start)
+
+        # Let listeners scheduled by `dispatch` (on_command, on_command_error, ...) run, outside the timed region
+        if n % 100 == 0:
+            await sleep(0)
+
+    operations = sum(getattr(bot.mongo.database, 'operations', {}).values()) - operations_before
+    requests = sum(bot.fake_http.requests.values()) - requests_before
+
+    start = perf_counter_ns()
+    for _ in range(0, iterations, concurrency):
+        await gather(*(bot.on_message(message()) for _ in range(concurrency)))
+    elapsed = perf_counter_ns() - start
+    await sleep(0)
+
+    samples.sort()
+    return {
+        'p50_us': percentile(samples, 0.5),
+        'p99_us': percentile(samples, 0.99),
+        'mean_us': sum(samples) / len(samples) / 1000,
+        'throughput_per_s': (iterations // concurrency * concurrency or concurrency) / (elapsed / 1e9),
+        'db_operations_per_message': operations / iterations,
+        'http_requests_per_message': requests / iterations
+    }
+
+
+async def main(iterations: int, concurrency: int, output: str, mongo_uri: str | None, /) -> None:
+    bot = CustomBot()
+
+    async with bot:
+        journal = NamedTemporaryFile(suffix='.journal', delete=False).name
+        mongo = await prepare(bot, mongo_uri, journal)
+
+        results = {}
+        try:
+            for name in SCENARIOS:
+                results[name] = await measure(bot, name, iterations, concurrency)
+                print(
+                    f'{name:>16}: p50 {results[name]["p50_us"]:>9.1f}us  p99 {results[name]["p99_us"]:>9.1f}us  '
+                    f'{results[name]["throughput_per_s"]:>10.0f} msg/s'
+                )
+        finally:
+            if mongo_uri is not None:
+                await mongo.__aexit__(None, None, None)
+                await mongo.client.drop_database('benchmark_dispatch')
+            else:
+                await mongo.close_journal()
+            remove(journal)
+
+    report = {
+        'commit': git_commit(),
+        'timestamp': datetime.now(tz=timezone.utc).isoformat(),
+        'python': python_version(),
+        'database': 'mongod' if mongo_uri is not None else 'memory',
+        'iterations': iterations,
+        'concurrency': concurrency,
+        'scenarios': results
+    }
+    with open(output, 'w') as file:
+        dump(report, file, indent=2)
+    print(f'Results written to {output}')
+
+
+if __name__ == '__main__':
+
+    basicConfig(level=WARNING)
+
+    parser = ArgumentParser(description='Benchmark message and command dispatch without a gateway connection.')
+    parser.add_argument('--iterations', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--output', default='dispatch.json')
+    parser.add_argument('--mongo-uri', default=None, help='Use a local mongod instead of the in-memory stand-in.')
+    args = parser.parse_args()
+
+    run(main(args.iterations, args.concurrency, args.output, args.mongo_uri))
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from random import Random
+from time import perf_counter
+
+from core.automod import DomainMatcher
+
+
+# Usage: python -m benchmarks.domains [--sizes 100 1000 10000] [--messages 20000]
+# Compares the compiled matcher against scanning every blacklisted domain with `in`.
+
+
+def build(size: int, messages: int, /) -> tuple[list[str], list[str]]:
+    rng = Random(size)
+    blacklist = [f'bad{n}.example{n % 97}.com' for n in range(size)]
+
+    corpus = []
+    for n in range(messages):
+        if n % 50 == 0:
+            corpus.append(f'check this out https://cdn.{rng.choice(blacklist)}/free-nitro')
+        elif n % 10 == 0:
+            corpus.append(f'see https://docs.python.org/3/library/re.html#{n}')
+        else:
+            corpus.append('hello everyone, how is it going today? ' * rng.randint(1, 3))
+    return blacklist, corpus
+
+
+def naive(blacklist: list[str], corpus: list[str], /) -> tuple[float, int]:
+    start = perf_counter()
+    hits = sum(any(domain in message for domain in blacklist) for message in corpus)
+    return perf_counter() - start, hits
+
+
+def compiled(blacklist: list[str], corpus: list[str], /) -> tuple[float, int]:
+    matcher = DomainMatcher(blacklist, ())
+    start = perf_counter()
+    hits = sum(matcher.find(message) is not None for message in corpus)
+    return perf_counter() - start, hits
+
+
+def main(sizes: list[int], messages: int, /) -> None:
+    print(f'{"domains":>8} {"naive (us/msg)":>16} {"compiled (us/msg)":>18} {"hits":>8}')
+    for size in sizes:
+        blacklist, corpus = build(size, messages)
+        naive_time, naive_hits = naive(blacklist, corpus)
+        compiled_time, compiled_hits = compiled(blacklist, corpus)
+        assert naive_hits == compiled_hits
+        print(
+            f'{size:>8} {naive_time / messages * 1e6:>16.2f} '
+            f'{compiled_time / messages * 1e6:>18.2f} {compiled_hits:>8}'
+        )
+
+
+if __name__ == '__main__':
+
+    parser = ArgumentParser(description='Benchmark automod domain matching against naive substring scanning.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--messages', type=int, default=20000)
+    args = parser.parse_args()
+
+    main(args.sizes, args.messages)
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from time import perf_counter
+
+from core.bot import CustomBot
+from core.embed import EmbedField
+
+
+# Usage: python -m benchmarks.embeds [--sizes 1000 2000 5000 10000] [--repeat 5]
+# Per-field cost should stay flat as the number of fields grows.
+
+
+def best_time(count: int, repeat: int, /) -> float:
+    fields = [EmbedField(name=f'Case {n}', value='x' * (n % 200 + 20)) for n in range(count)]
+
+    best = float('inf')
+    for _ in range(repeat):
+        start = perf_counter()
+        CustomBot.fields_to_embeds(fields, title='Modlogs', author_name='Benchmark', author_icon='https://')
+        best = min(best, perf_counter() - start)
+    return best
+
+
+def main(sizes: list[int], repeat: int, /) -> None:
+    print(f'{"fields":>8} {"total (ms)":>12} {"per field (us)":>16}')
+    for count in sizes:
+        elapsed = best_time(count, repeat)
+        print(f'{count:>8} {elapsed * 1e3:>12.2f} {elapsed / count * 1e6:>16.2f}')
+
+
+if __name__ == '__main__':
+
+    parser = ArgumentParser(description='Measure how CustomBot.fields_to_embeds scales with the number of fields.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 2000, 5000, 10000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    main(args.sizes, args.repeat)
@@ -0,0 +1,359 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+from asyncio import sleep
+from collections import Counter
+from itertools import count
+from operator import lt, le, gt, ge, ne
+
+from pymongo import ReturnDocument, InsertOne, UpdateOne, ReplaceOne, DeleteOne
+from discord.http import Route
+
+if TYPE_CHECKING:
+    from typing import Any
+    from collections.abc import AsyncIterator
+
+    Dict = dict[str, Any]
+
+
+# Offline stand-ins used by the benchmarks: an in-memory subset of Motor, and Discord objects / HTTP.
+# They implement only what the bot's hot paths call, and make no attempt to be general.
+
+
+_operators = {'$lt': lt, '$lte': le, '$gt': gt, '$gte': ge, '$ne': ne}
+
+
+def matches(document: Dict, query: Dict, /) -> bool:
+    for key, condition in query.items():
+        if key == '$and':
+            if not all(matches(document, subquery) for subquery in condition):
+                return False
+            continue
+
+        value = document.get(key)
+        if isinstance(condition, dict) and condition and all(op.startswith('$') for op in condition):
+            for op, operand in condition.items():
+                if op == '$in':
+                    if value not in operand:
+                        return False
+                elif op == '$exists':
+                    if (key in document) is not operand:
+                        return False
+                elif value is None or not _operators[op](value, operand):
+                    return False
+        elif value != condition:
+            return False
+    return True
+
+
+def apply_update(document: Dict, update: Dict, /, *, inserting: bool = False) -> None:
+    if isinstance(update, list):
+        raise NotImplementedError('Pipeline updates are not supported by the in-memory collection.')
+
+    for op, fields in update.items():
+        for key, value in fields.items():
+            if op == '$set' or (op == '$setOnInsert' and inserting is True):
+                document[key] = value
+            elif op == '$inc':
+                document[key] = document.get(key, 0) + value
+            elif op == '$max':
+                document[key] = value if key not in document else max(document[key], value)
+
+
+def project(document: Dict, projection: Dict | None, /) -> Dict:
+    if not projection:
+        return dict(document)
+    included = {key for key, value in projection.items() if value}
+    projected = {key: value for key, value in document.items() if key in included}
+    if projection.get('_id', True) and '_id' in document:
+        projected['_id'] = document['_id']
+    return projected
+
+
+class Result:
+
+    def __init__(self, **kwargs: Any) -> None:
+        self.__dict__.update(kwargs)
+
+
+class MemoryCursor:
+
+    def __init__(self, documents: list[Dict], /) -> None:
+        self.documents: list[Dict] = documents
+
+    async def __aiter__(self) -> AsyncIterator[Dict]:
+        for document in self.documents:
+            yield document
+
+
+class MemoryCollection:
+
+    def __init__(self) -> None:
+        self.documents: list[Dict] = []
+        self.ids = count(1)
+        self.operations: Counter[str] = Counter()
+
+    def _select(self, query: Dict | None, sort: list[tuple[str, int]] | None = None, /) -> list[Dict]:
+        selected = [document for document in self.documents if matches(document, query or {})]
+        for key, direction in reversed(sort or []):
+            selected.sort(key=lambda document: document.get(key), reverse=direction < 0)
+        return selected
+
+    def _insert(self, document: Dict, /) -> None:
+        document.setdefault('_id', next(self.ids))
+        self.documents.append(document)
+
+    def _upsert(self, query: Dict, update: Dict, /) -> Dict:
+        document = {
+            key: value for key, value in query.items()
+            if not (isinstance(value, dict) and all(op.startswith('$') for op in value))
+        }
+        apply_update(document, update, inserting=True)
+        self._insert(document)
+        return document
+
+    async def create_indexes(self, *_: Any, **__: Any) -> list[str]:
+        return []
+
+    def find(
+        self,
+        query: Dict | None = None,
+        *,
+        projection: Dict | None = None,
+        sort: list[tuple[str, int]] | None = None,
+        limit: int = 0,
+        **_: Any
+    ) -> MemoryCursor:
+        self.operations['find'] += 1
+        selected = self._select(query, sort)
+        if limit:
+            selected = selected[:limit]
+        return MemoryCursor([project(document, projection) for document in selected])
+
+    async def find_one(
+        self,
+        query: Dict | None = None,
+        *,
+        projection: Dict | None = None,
+        sort: list[tuple[str, int]] | None = None,
+        **_: Any
+    ) -> Dict | None:
+        self.operations['find_one'] += 1
+        selected = self._select(query, sort)
+        return project(selected[0], projection) if selected else None
+
+    async def find_one_and_update(
+        self,
+        query: Dict,
+        update: Dict,
+        *,
+        upsert: bool = False,
+        return_document: bool = ReturnDocument.BEFORE,
+        **_: Any
+    ) -> Dict | None:
+        self.operations['find_one_and_update'] += 1
+        selected = self._select(query)
+
+        if not selected:
+            if upsert is False:
+                return None
+            document = self._upsert(query, update)
+            return dict(document) if return_document == ReturnDocument.AFTER else None
+
+        document = selected[0]
+        before = dict(document)
+        apply_update(document, update)
+        return dict(document) if return_document == ReturnDocument.AFTER else before
+
+    async def insert_one(self, document: Dict, **_: Any) -> Result:
+        self.operations['insert_one'] += 1
+        self._insert(document)
+        return Result(inserted_id=document['_id'])
+
+    async def insert_many(self, documents: list[Dict], **_: Any) -> Result:
+        self.operations['insert_many'] += 1
+        for document in documents:
+            self._insert(document)
+        return Result(inserted_ids=[document['_id'] for document in documents])
+
+    def _update_one(self, query: Dict, update: Dict, upsert: bool, /) -> int:
+        selected = self._select(query)
+        if selected:
+            apply_update(selected[0], update)
+            return 1
+        if upsert is True:
+            self._upsert(query, update)
+        return 0
+
+    def _replace_one(self, query: Dict, replacement: Dict, upsert: bool, /) -> int:
+        selected = self._select(query)
+        if selected:
+            selected[0].clear()
+            selected[0].update(replacement)
+            return 1
+        if upsert is True:
+            self._insert(dict(replacement))
+        return 0
+
+    def _delete_one(self, query: Dict, /) -> int:
+        selected = self._select(query)
+        if selected:
+            self.documents.remove(selected[0])
+            return 1
+        return 0
+
+    async def update_one(self, query: Dict, update: Dict, *, upsert: bool = False, **_: Any) -> Result:
+        self.operations['update_one'] += 1
+        return Result(modified_count=self._update_one(query, update, upsert))
+
+    async def update_many(self, query: Dict, update: Dict, **_: Any) -> Result:
+        self.operations['update_many'] += 1
+        selected = self._select(query)
+        for document in selected:
+            apply_update(document, update)
+        return Result(modified_count=len(selected))
+
+    async def replace_one(self, query: Dict, replacement: Dict, *, upsert: bool = False, **_: Any) -> Result:
+        self.operations['replace_one'] += 1
+        return Result(modified_count=self._replace_one(query, replacement, upsert))
+
+    async def delete_one(self, query: Dict, **_: Any) -> Result:
+        self.operations['delete_one'] += 1
+        return Result(deleted_count=self._delete_one(query))
+
+    async def bulk_write(self, requests: list[Any], **_: Any) -> Result:
+        # Reads pymongo's request objects directly; fine for a benchmark fixture
+        self.operations['bulk_write'] += 1
+        modified = 0
+        for request in requests:
+            if isinstance(request, InsertOne):
+                self._insert(request._doc)
+            elif isinstance(request, UpdateOne):
+                modified += self._update_one(request._filter, request._doc, bool(request._upsert))
+            elif isinstance(request, ReplaceOne):
+                modified += self._replace_one(request._filter, request._doc, bool(request._upsert))
+            elif isinstance(request, DeleteOne):
+                self._delete_one(request._filter)
+        return Result(modified_count=modified)
+
+    async def count_documents(self, query: Dict, **_: Any) -> int:
+        self.operations['count_documents'] += 1
+        return len(self._select(query))
+
+    async def estimated_document_count(self, **_: Any) -> int:
+        return len(self.documents)
+
+
+class MemoryDatabase:
+
+    def __init__(self) -> None:
+        self.collections: dict[str, MemoryCollection] = {}
+
+    def __getitem__(self, name: str, /) -> MemoryCollection:
+        if name not in self.collections:
+            self.collections[name] = MemoryCollection()
+        return self.collections[name]
+
+    def __getattr__(self, name: str, /) -> MemoryCollection:
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return self[name]
+
+    @property
+    def operations(self) -> Counter[str]:
+        total = Counter()
+        for name, collection in self.collections.items():
+            total.update({f'{name}.{op}': n for op, n in collection.operations.items()})
+        return total
+
+
+class FakeHTTP:
+
+    # Replaces `HTTPClient.request`; every REST call is counted by route and answered with an empty payload
+
+    def __init__(self, *, latency: float = 0.0) -> None:
+        self.requests: Counter[str] = Counter()
+        self.latency: float = latency
+
+    async def request(self, route: Any, **_: Any) -> Any:
+        self.requests[f'{route.method} {route.path}'] += 1
+        if self.latency:
+            await sleep(self.latency)
+        return {}
+
+
+class FakeRole:
+
+    def __init__(self, role_id: int, /, *, guild_id: int = 0) -> None:
+        self.id: int = role_id
+        self.guild_id: int = guild_id
+
+    def is_default(self) -> bool:
+        return self.id == self.guild_id
+
+
+class FakeMember:
+
+    def __init__(
+        self,
+        member_id: int,
+        /,
+        *,
+        roles: list[FakeRole] | None = None,
+        bot: bool = False,
+        http: FakeHTTP | None = None
+    ) -> None:
+        self.id: int = member_id
+        self.roles: list[FakeRole] = roles or []
+        self.bot: bool = bot
+        self.name: str = f'member{member_id}'
+        self.mention: str = f'<@{member_id}>'
+        self.http: FakeHTTP | None = http
+
+    # Role updates issue the same requests as `discord.Member`: one per role for add / remove, one for edit
+
+    async def add_roles(self, *roles: FakeRole, reason: str | None = None) -> None:
+        for role in roles:
+            await self.http.request(Route('PUT', '/guilds/{guild_id}/members/{user_id}/roles/{role_id}'))
+            self.roles.append(role)
+
+    async def remove_roles(self, *roles: FakeRole, reason: str | None = None) -> None:
+        for role in roles:
+            await self.http.request(Route('DELETE', '/guilds/{guild_id}/members/{user_id}/roles/{role_id}'))
+            self.roles = [existing for existing in self.roles if existing.id != role.id]
+
+    async def edit(self, *, roles: list[Any], reason: str | None = None) -> None:
+        await self.http.request(Route('PATCH', '/guilds/{guild_id}/members/{user_id}'))
+        # Like Discord, @everyone is kept whatever roles are sent
+        self.roles = [role for role in self.roles if role.is_default()] + [FakeRole(role.id) for role in roles]
+
+
+class FakeChannel:
+
+    def __init__(self, channel_id: int, /) -> None:
+        self.id: int = channel_id
+
+
+class FakeGuild:
+
+    def __init__(self, guild_id: int, /, *, owner_id: int = 0) -> None:
+        self.id: int = guild_id
+        self.owner_id: int = owner_id
+        self.members: dict[int, FakeMember] = {}
+
+    def get_member(self, member_id: int, /) -> FakeMember | None:
+        return self.members.get(member_id)
+
+
+class FakeMessage:
+
+    _ids = count(1)
+
+    def __init__(self, state: Any, content: str, author: FakeMember, channel: FakeChannel, guild: FakeGuild, /) -> None:
+        self._state: Any = state
+        self.id: int = next(self._ids)
+        self.content: str = content
+        self.attachments: list[Any] = []
+        self.author: FakeMember = author
+        self.channel: FakeChannel = channel
+        self.guild: FakeGuild = guild
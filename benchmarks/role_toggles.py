@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from asyncio import create_task, gather, run, sleep
+from time import perf_counter
+
+from core.bot import CustomBot
+from core.roles import RoleToggleCoalescer
+from benchmarks.fakes import FakeHTTP, FakeRole, FakeMember
+
+
+# Usage: python -m benchmarks.role_toggles [--members 20] [--roles 15] [--click-interval 0.1] [--latency 0.05]
+# Every member clicks through a role menu at once, toggling each role via per-click add / remove calls, then via
+# `RoleToggleCoalescer`. Requests are counted by a fake HTTP layer; latency is per click, until its followup.
+
+
+GUILD_ID = 1
+
+
+async def click_through(member: FakeMember, roles: list[FakeRole], interval: float, toggle, /) -> list[float]:
+
+    async def click(role: FakeRole, /) -> float:
+        start = perf_counter()
+        await toggle(member, role)
+        return perf_counter() - start
+
+    clicks = []
+    for role in roles:
+        # Started as tasks, so each click happens `interval` seconds after the last instead of all at once
+        clicks.append(create_task(click(role)))
+        await sleep(interval)
+    return await gather(*clicks)
+
+
+async def measure(coalesced: bool, members: int, roles: int, interval: float, latency: float, /) -> None:
+    bot = CustomBot()
+    http = FakeHTTP(latency=latency)
+    coalescer = RoleToggleCoalescer(bot)
+
+    menu = [FakeRole(role_id, guild_id=GUILD_ID) for role_id in range(100, 100 + roles)]
+    clickers = [FakeMember(member_id, roles=[FakeRole(GUILD_ID, guild_id=GUILD_ID)], http=http)
+                for member_id in range(1000, 1000 + members)]
+
+    async def per_click(member: FakeMember, role: FakeRole, /) -> None:
+        if any(existing.id == role.id for existing in member.roles):
+            await member.remove_roles(role)
+        else:
+            await member.add_roles(role)
+
+    async def batched(member: FakeMember, role: FakeRole, /) -> None:
+        await coalescer.toggle(member, role.id)
+
+    start = perf_counter()
+    samples = sorted(sum(await gather(*(
+        click_through(member, menu, interval, batched if coalesced else per_click) for member in clickers
+    )), []))
+    elapsed = perf_counter() - start
+
+    toggles = members * roles
+    requests = sum(http.requests.values())
+    granted = sum(len(member.roles) - 1 for member in clickers)
+    print(
+        f'{"coalesced" if coalesced else "per-click":>10}: {requests:>6} request(s)  '
+        f'{requests / toggles:>5.2f} per toggle  '
+        f'p50 {samples[len(samples) // 2] * 1e3:>7.1f}ms  p99 {samples[int(len(samples) * 0.99)] * 1e3:>7.1f}ms  '
+        f'{elapsed:>6.2f}s total  {granted}/{toggles} role(s) granted'
+    )
+
+
+async def main(members: int, roles: int, interval: float, latency: float, /) -> None:
+    for coalesced in False, True:
+        await measure(coalesced, members, roles, interval, latency)
+
+
+if __name__ == '__main__':
+
+    parser = ArgumentParser(description='Compare Discord requests made for role menu clicks, per click and coalesced.')
+    parser.add_argument('--members', type=int, default=20)
+    parser.add_argument('--roles', type=int, default=15)
+    parser.add_argument('--click-interval', type=float, default=0.1)
+    parser.add_argument('--latency', type=float, default=0.05, help='Simulated round trip per Discord request.')
+    args = parser.parse_args()
+
+    run(main(args.members, args.roles, args.click_interval, args.latency))
@@ -1,23 +1,170 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING
 
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+from core.embed import CustomEmbed
+
 from discord.ui import View, button
 from discord import ButtonStyle, HTTPException
 
 if TYPE_CHECKING:
+    from typing import Any, Self
+    from collections.abc import Callable
+
+    from core.bot import CustomBot
+    from core.modlog import Modlog
+    from core.embed import EmbedField
+
     from discord.ui import Button
     from discord import User, Member, Message, Embed, Interaction
 
     AuthorType = User | Member | None
 
 
+class PageSource(ABC):
+
+    # Number of rendered pages kept in memory
+    __cache_size__ = 8
+
+    def __init__(self, page_count: int, /) -> None:
+        self.page_count: int = max(page_count, 1)
+        self._pages: OrderedDict[int, Embed] = OrderedDict()
+
+    @abstractmethod
+    async def render_page(self, page: int, /) -> Embed:
+        ...
+
+    async def get_page(self, page: int, /) -> Embed:
+        try:
+            embed = self._pages[page]
+        except KeyError:
+            embed = self._pages[page] = await self.render_page(page)
+            if len(self._pages) > self.__cache_size__:
+                self._pages.popitem(last=False)
+        else:
+            self._pages.move_to_end(page)
+        return embed
+
+
+class ListPageSource(PageSource):
+
+    def __init__(self, embeds: list[Embed], /) -> None:
+        super().__init__(len(embeds))
+        self.embeds: list[Embed] = embeds
+
+    async def render_page(self, page: int, /) -> Embed:
+        return self.embeds[page - 1]
+
+    async def get_page(self, page: int, /) -> Embed:
+        # Already rendered, so there's nothing to cache
+        return await self.render_page(page)
+
+
+class ModlogPageSource(PageSource):
+
+    def __init__(
+        self,
+        bot: CustomBot,
+        page_count: int,
+        formatter: Callable[[Modlog], EmbedField],
+        /, *,
+        per_page: int = 6,
+        descending: bool = True,
+        embed_kwargs: dict[str, Any],
+        query: dict[str, Any]
+    ) -> None:
+        super().__init__(page_count)
+        self.bot: CustomBot = bot
+        self.formatter: Callable[[Modlog], EmbedField] = formatter
+        self.per_page: int = per_page
+        self.descending: bool = descending
+        self.embed_kwargs: dict[str, Any] = embed_kwargs
+        self.query: dict[str, Any] = query
+
+        # Last case ID on each page seen so far; page 0 is the (empty) start of the collection
+        self.boundaries: dict[int, int | None] = {0: None}
+
+    @classmethod
+    async def create(
+        cls,
+        bot: CustomBot,
+        formatter: Callable[[Modlog], EmbedField],
+        /, *,
+        per_page: int = 6,
+        descending: bool = True,
+        embed_kwargs: dict[str, Any] | None = None,
+        **query: Any
+    ) -> Self:
+        count = await bot.mongo.count_modlogs(**query)
+        return cls(
+            bot,
+            -(-count // per_page),
+            formatter,
+            per_page=per_page,
+            descending=descending,
+            embed_kwargs=embed_kwargs or {},
+            query=query
+        )
+
+    async def find_boundary(self, page: int, /) -> int | None:
+        # Keyset pagination can't skip, so walk forward from the nearest known page fetching only case IDs
+        known = max(known for known in self.boundaries if known < page)
+        if known == page - 1:
+            return self.boundaries[known]
+
+        seen = 0
+        async for entry in self.bot.mongo.iter_modlog_fields(
+            limit=(page - 1 - known) * self.per_page,
+            after=self.boundaries[known],
+            descending=self.descending,
+            **self.query
+        ):
+            seen += 1
+            if seen % self.per_page == 0:
+                self.boundaries[known + seen // self.per_page] = entry['case_id']
+
+        return self.boundaries.get(page - 1)
+
+    async def render_page(self, page: int, /) -> Embed:
+        embed = CustomEmbed(
+            title=self.embed_kwargs.get('title'),
+            colour=self.embed_kwargs.get('colour'),
+            description=self.embed_kwargs.get('description'),
+            timestamp=self.embed_kwargs.get('timestamp')
+        )
+
+        author_name = self.embed_kwargs.get('author_name')
+        author_icon = self.embed_kwargs.get('author_icon')
+        if author_name is not None and author_icon is not None:
+            embed.set_author(name=author_name, icon_url=author_icon)
+
+        last_case_id = None
+        async for modlog in self.bot.mongo.iter_modlogs(
+            batch_size=self.per_page,
+            limit=self.per_page,
+            after=await self.find_boundary(page),
+            descending=self.descending,
+            **self.query
+        ):
+            embed.add_custom_field(self.formatter(modlog))
+            last_case_id = modlog.case_id
+
+        if last_case_id is not None and len(embed.fields) == self.per_page:
+            self.boundaries[page] = last_case_id
+
+        embed.set_footer(text=f'Page {page} of {self.page_count}')
+        return embed
+
+
 class Paginator(View):
 
-    def __init__(self, author: AuthorType, message: Message, embeds: list[Embed], /) -> None:
+    def __init__(self, author: AuthorType, message: Message, source: PageSource | list[Embed], /) -> None:
         super().__init__(timeout=120)
         self.author: AuthorType = author
         self.message: Message = message
-        self.embeds: list[Embed] = embeds
+        self.source: PageSource = ListPageSource(source) if isinstance(source, list) else source
         self.current_page: int = 1
         self.update_buttons()
 
@@ -26,12 +173,12 @@ class Paginator(View):
             child: Button
             child.disabled = True
         self.firs_page.disabled = self.prev_page.disabled = self.current_page == 1
-        self.last_page.disabled = self.next_page.disabled = self.current_page == len(self.embeds)
+        self.last_page.disabled = self.next_page.disabled = self.current_page == self.source.page_count
 
     async def edit_page(self, interaction: Interaction, /) -> None:
         await interaction.response.defer() # noqa
         self.update_buttons()
-        await self.message.edit(embed=self.embeds[self.current_page - 1], view=self)
+        await self.message.edit(embed=await self.source.get_page(self.current_page), view=self)
 
     @button(label='<<')
     async def firs_page(self, interaction: Interaction, _: Button, /) -> None:
@@ -50,7 +197,7 @@ class Paginator(View):
 
     @button(label='>>')
     async def last_page(self, interaction: Interaction, _: Button, /) -> None:
-        self.current_page = len(self.embeds)
+        self.current_page = self.source.page_count
         await self.edit_page(interaction)
 
     async def interaction_check(self, interaction: Interaction, /) -> bool:
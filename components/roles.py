@@ -3,32 +3,47 @@ from typing import TYPE_CHECKING
 
 from resources.emojis import ROLE_ICON
 
-from discord.ui import Button, View
+from discord.ui import DynamicItem, Button, View
 from discord import Colour, HTTPException, Embed
 
 if TYPE_CHECKING:
+    from typing import Self
+    from re import Match
+
+    from discord.ui import Item
+    from core.bot import CustomBot
+
     from discord import Role, Interaction
 
 
-class RoleButton(Button):
+class RoleButton(DynamicItem[Button], template=r'r(?P<role_id>\d+)'):
+
+    # Only the role ID is kept; the role is resolved from the guild cache on click, so any number of menus
+    # share the single registration in `setup_hook` and keep working across restarts
+    def __init__(self, role_id: int, /, *, label: str | None = None) -> None:
+        super().__init__(Button(label=label, emoji=ROLE_ICON, custom_id=f'r{role_id}'))
+        self.role_id: int = role_id
 
-    def __init__(self, role: Role, /) -> None:
-        super().__init__(label=role.name, emoji=ROLE_ICON, custom_id=f'r{role.id}')
-        self.role: Role = role
+    @classmethod
+    async def from_custom_id(cls, _: Interaction, __: Item, match: Match[str], /) -> Self:
+        return cls(int(match['role_id']))
 
-    async def callback(self, interaction: Interaction, /) -> None:
+    async def callback(self, interaction: Interaction[CustomBot], /) -> None:
         await interaction.response.defer(thinking=True, ephemeral=True) # noqa
 
         try:
-            if self.role in interaction.user.roles:
-                await interaction.user.remove_roles(self.role)
-                message = f'*{self.role.mention} removed.*'
+            role = interaction.guild.get_role(self.role_id)
+            if role is None:
+                raise LookupError('role no longer exists')
+
+            # Clicks through a menu are batched into one member edit, each still gets the outcome of its own toggle
+            if await interaction.client.role_toggles.toggle(interaction.user, role.id) is True:
+                message = f'*{role.mention} added.*'
             else:
-                await interaction.user.add_roles(self.role)
-                message = f'*{self.role.mention} added.*'
+                message = f'*{role.mention} removed.*'
             colour = Colour.green()
 
-        except (AttributeError, HTTPException) as error:
+        except (AttributeError, LookupError, HTTPException, OSError) as error:
             message = f'❌ Something went wrong, please contact a member of staff. Error: `{error}`'
             colour = Colour.red()
 
@@ -40,8 +55,5 @@ class RoleView(View):
 
     def __init__(self, *roles: Role) -> None:
         super().__init__(timeout=None)
-        for role in roles:
-            if len(self.children) <= 25:
-                self.add_item(RoleButton(role))
-            else:
-                break
+        for role in roles[:25]:
+            self.add_item(RoleButton(role.id, label=role.name))
@@ -1,36 +1,44 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING
 
-from discord.ui import View, button
-from discord import HTTPException
+from discord.ui import DynamicItem, Button, View
 
 if TYPE_CHECKING:
+    from typing import Self
+    from re import Match
+
     from core.bot import CustomBot
 
-    from discord.ui import Button
-    from discord import Message, Interaction
+    from discord.ui import Item
+    from discord import Interaction
 
 
-class TracebackView(View):
+class TracebackButton(DynamicItem[Button], template=r'tb:(?P<fingerprint>[0-9a-f]{12})'):
 
-    def __init__(self, bot: CustomBot, message: Message, traceback: str, /) -> None:
-        super().__init__(timeout=86400)
-        self.bot: CustomBot = bot
-        self.message: Message = message
-        self.traceback: str = traceback
+    def __init__(self, fingerprint: str, /) -> None:
+        super().__init__(Button(label='Full Traceback', custom_id=f'tb:{fingerprint}'))
+        self.fingerprint: str = fingerprint
 
-    @button(label='Full Traceback')
-    async def view_traceback(self, interaction: Interaction, _: Button, /) -> None:
-        await interaction.response.send_message(self.traceback, ephemeral=True) # noqa
+    @classmethod
+    async def from_custom_id(cls, _: Interaction, __: Item, match: Match[str], /) -> Self:
+        return cls(match['fingerprint'])
 
-    async def interaction_check(self, interaction: Interaction, /) -> bool:
-        if await self.bot.member_clearance(interaction.user) < 9:
+    async def interaction_check(self, interaction: Interaction[CustomBot], /) -> bool:
+        if await interaction.client.member_clearance(interaction.user) < 9:
             await interaction.response.send_message('You can\'t use that.', ephemeral=True) # noqa
             return False
         return True
 
-    async def on_timeout(self) -> None:
-        try:
-            await self.message.edit(view=None)
-        except HTTPException:
-            pass
+    async def callback(self, interaction: Interaction[CustomBot], /) -> None:
+        traceback = await interaction.client.tracebacks.get(self.fingerprint)
+        if traceback is None:
+            traceback = 'This traceback is no longer available.'
+        await interaction.response.send_message(traceback, ephemeral=True) # noqa
+
+
+class TracebackView(View):
+
+    # Holds no state; clicks are routed to `TracebackButton` by its custom ID, even after a restart
+    def __init__(self, fingerprint: str, /) -> None:
+        super().__init__(timeout=None)
+        self.add_item(TracebackButton(fingerprint))
@@ -0,0 +1,161 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+from asyncio import Lock
+from logging import getLogger
+from collections import Counter, defaultdict
+from time import monotonic
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from typing import Self
+
+    from core.bot import CustomBot
+    from core.mongo import MongoDBClient
+
+
+_logger = getLogger(__name__)
+
+
+class ModlogColumns:
+
+    # Non-deleted modlogs as parallel NumPy arrays; roughly 33 bytes per case instead of a `Modlog` per case
+
+    __slots__ = 'case_ids', 'user_ids', 'mod_ids', 'type_codes', 'created', 'types'
+
+    # Documents converted to arrays at a time while streaming
+    __chunk_size__ = 10000
+
+    __row__ = np.dtype([
+        ('case_id', np.int64),
+        ('user_id', np.uint64),
+        ('mod_id', np.uint64),
+        ('type_code', np.uint8),
+        ('created', np.int64)
+    ])
+
+    def __init__(
+        self,
+        case_ids: np.ndarray,
+        user_ids: np.ndarray,
+        mod_ids: np.ndarray,
+        type_codes: np.ndarray,
+        created: np.ndarray,
+        types: tuple[str, ...],
+        /
+    ) -> None:
+        self.case_ids: np.ndarray = case_ids
+        self.user_ids: np.ndarray = user_ids
+        self.mod_ids: np.ndarray = mod_ids
+        self.type_codes: np.ndarray = type_codes
+        self.created: np.ndarray = created
+        self.types: tuple[str, ...] = types
+
+    def __len__(self) -> int:
+        return len(self.case_ids)
+
+    @classmethod
+    async def load(cls, mongo: MongoDBClient, /) -> Self:
+        codes: dict[str, int] = {}
+        chunks: list[tuple[np.ndarray, ...]] = []
+        rows: list[tuple[int, int, int, int, int]] = []
+
+        def flush() -> None:
+            # Structured conversion keeps each column's dtype, without a pass per column over Python objects
+            array = np.array(rows, dtype=cls.__row__)
+            chunks.append(tuple(array[name] for name in cls.__row__.names))
+            rows.clear()
+
+        async for entry in mongo.iter_modlog_fields('user_id', 'mod_id', 'type', 'created', deleted=False):
+            code = codes.setdefault(entry['type'], len(codes))
+            rows.append((entry['case_id'], entry['user_id'], entry['mod_id'], code, entry['created']))
+            if len(rows) >= cls.__chunk_size__:
+                flush()
+
+        if rows or not chunks:
+            flush()
+
+        return cls(*(np.concatenate(column) for column in zip(*chunks)), tuple(codes))
+
+    def moderator_counts(self, *, since: int = 0) -> list[tuple[int, int]]:
+        mod_ids = self.mod_ids[self.created >= since]
+        ids, counts = np.unique(mod_ids, return_counts=True)
+        order = np.lexsort((ids, -counts))
+        return list(zip(ids[order].tolist(), counts[order].tolist()))
+
+    def daily_type_counts(self, *, since: int = 0) -> tuple[list[int], np.ndarray]:
+        # Returns the day starts (epoch seconds) and a days x types matrix of counts, for days with any modlogs
+        selected = self.created >= since - since % 86400
+        days, day_index = np.unique(self.created[selected] // 86400, return_inverse=True)
+
+        counts = np.bincount(
+            day_index * len(self.types) + self.type_codes[selected],
+            minlength=len(days) * len(self.types)
+        ).reshape(len(days), len(self.types))
+        return (days * 86400).tolist(), counts
+
+    def repeat_offenders(self, *, minimum: int = 2, since: int = 0) -> list[tuple[int, int, int]]:
+        # Returns (user ID, case count, most recent case time), most cases first
+        selected = self.created >= since
+        ids, index, counts = np.unique(self.user_ids[selected], return_inverse=True, return_counts=True)
+
+        latest = np.zeros(len(ids), dtype=np.int64)
+        np.maximum.at(latest, index, self.created[selected])
+
+        repeat = counts >= minimum
+        ids, counts, latest = ids[repeat], counts[repeat], latest[repeat]
+        order = np.lexsort((-latest, -counts))
+        return list(zip(ids[order].tolist(), counts[order].tolist(), latest[order].tolist()))
+
+
+class ModlogAnalytics:
+
+    # Per-moderator and per-day counts are read from the daily rollups, a few hundred documents at most; the
+    # columnar snapshot answers per-user questions, and computes the same counts in a single vectorised pass
+
+    # Seconds a loaded snapshot is reused for; analytics tolerate slightly stale data, a full scan per command doesn't
+    __ttl__ = 600
+
+    def __init__(self, bot: CustomBot, /) -> None:
+        self.bot: CustomBot = bot
+
+        self.__columns: ModlogColumns | None = None
+        self.__loaded_at: float = 0.0
+        self.__lock: Lock = Lock()
+
+    async def columns(self) -> ModlogColumns:
+        async with self.__lock:
+            if self.__columns is None or monotonic() - self.__loaded_at > self.__ttl__:
+                self.__columns = await ModlogColumns.load(self.bot.mongo)
+                self.__loaded_at = monotonic()
+        return self.__columns
+
+    def rollups_built(self) -> bool:
+        if self.bot.mongo.rollups_built is False:
+            _logger.warning('Modlog rollups have not been built, counting from the columnar snapshot instead')
+        return self.bot.mongo.rollups_built
+
+    async def moderator_counts(self, *, since: int = 0) -> list[tuple[int, int]]:
+        if self.rollups_built() is False:
+            return (await self.columns()).moderator_counts(since=since)
+
+        counts: Counter[int] = Counter()
+        for rollup in await self.bot.mongo.get_modlog_rollups(since):
+            counts[rollup['_id']['mod_id']] += rollup['count']
+        return sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+
+    async def daily_type_counts(self, *, since: int = 0) -> dict[int, Counter[str]]:
+        # Day starts (epoch seconds), in order, mapped to counts per modlog type
+        if self.rollups_built() is False:
+            columns = await self.columns()
+            day_starts, counts = columns.daily_type_counts(since=since)
+            return {
+                day_start: Counter({columns.types[code]: count for code, count in enumerate(row.tolist()) if count})
+                for day_start, row in zip(day_starts, counts)
+            }
+
+        days: defaultdict[int, Counter[str]] = defaultdict(Counter)
+        for rollup in await self.bot.mongo.get_modlog_rollups(since):
+            days[rollup['_id']['day']][rollup['_id']['type']] += rollup['count']
+        return dict(sorted(days.items()))
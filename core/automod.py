@@ -0,0 +1,72 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+from functools import lru_cache
+from re import compile, IGNORECASE
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+# Hosts of links Discord would render; anything after the host (port, path, query) is irrelevant here
+URL_PATTERN = compile(r'(?:https?://(?:[^\s/@]+@)?|\bwww\.)([a-z0-9.-]+)', IGNORECASE)
+
+
+class DomainTrie:
+
+    # Domains are stored as reversed labels (`a.example.com` -> com, example, a), so a match also covers subdomains
+
+    __slots__ = '_root',
+
+    __end__ = ''
+
+    def __init__(self, domains: Iterable[str], /) -> None:
+        self._root: dict[str, dict] = {}
+
+        for domain in domains:
+            labels = domain.strip().lower().removeprefix('*.').strip('.').split('.')
+            if labels == ['']:
+                continue
+
+            node = self._root
+            for label in reversed(labels):
+                node = node.setdefault(label, {})
+            node[self.__end__] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self._root)
+
+    def match(self, host: str, /) -> bool:
+        node = self._root
+        for label in reversed(host.split('.')):
+            node = node.get(label)
+            if node is None:
+                return False
+            if self.__end__ in node:
+                return True
+        return False
+
+
+class DomainMatcher:
+
+    __slots__ = 'blacklist', 'whitelist'
+
+    def __init__(self, blacklist: Iterable[str], whitelist: Iterable[str], /) -> None:
+        self.blacklist: DomainTrie = DomainTrie(blacklist)
+        self.whitelist: DomainTrie = DomainTrie(whitelist)
+
+    def find(self, content: str, /) -> str | None:
+        # Returns the first blacklisted host linked in `content`, unless it's also whitelisted
+        if not self.blacklist or '.' not in content:
+            return None
+
+        for match in URL_PATTERN.finditer(content):
+            host = match.group(1).lower().strip('.')
+            if self.blacklist.match(host) and not self.whitelist.match(host):
+                return host
+
+
+@lru_cache(maxsize=4)
+def compile_domains(blacklist: tuple[str, ...], whitelist: tuple[str, ...], /) -> DomainMatcher:
+    # Cached on the lists themselves, so unrelated metadata updates reuse the existing matcher
+    return DomainMatcher(blacklist, whitelist)
@@ -2,19 +2,31 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 from datetime import datetime, timezone, timedelta
-from traceback import format_exception
 from logging import getLogger
-from asyncio import run
+from asyncio import run, gather, create_task, Semaphore
 from os import listdir
+from os.path import isdir
+from collections import OrderedDict
+from contextlib import contextmanager, AsyncExitStack
+from time import perf_counter
 
 from resources.config import *
 from core.mongo import MongoDBClient
 from core.mee6 import MEE6APIClient
 from core.help import CustomHelpCommand
-from core.embed import CustomEmbed
-from core.modlog import Modlog
-from core.errors import DurationError, ModlogNotFound
-from components.traceback import TracebackView
+from core.embed import CustomEmbed, iter_embeds
+from core.modlog import Modlog, ExpiredModlog
+from core.scheduler import ExpiryScheduler
+from core.replica import ModlogReplica
+from core.levels import LevelSync
+from core.roles import RoleToggleCoalescer
+from core.metrics import MetricsRegistry, MetricsServer
+from core.errors import DurationError
+from core.tracebacks import TracebackStore
+from components.traceback import TracebackView, TracebackButton
+from components.roles import RoleButton
+
+from pymongo.errors import PyMongoError
 
 from discord.ext import commands, tasks
 from discord.utils import MISSING
@@ -25,25 +37,28 @@ from discord import (
     HTTPException,
     Activity,
     ActivityType,
-    Colour
+    Colour,
+    Member,
+    Object
 )
 
 if TYPE_CHECKING:
     from typing import Any
     from types import TracebackType
-    from collections.abc import Iterable
+    from collections.abc import Iterable, Iterator
 
     from core.metadata import MetaData
     from core.embed import EmbedField
 
     from discord.ui import View
     from discord.abc import Messageable
+    from discord.http import Route
     from discord.utils import _MissingSentinel
     from discord import (
         Guild,
         User,
         Message,
-        Member
+        Role
     )
 
     ViewType = View | _MissingSentinel
@@ -55,6 +70,17 @@ _logger = getLogger(__name__)
 class CustomBot(commands.Bot):
 
     __durations__ = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800, 'y': 31536000}
+    __clearance_cache_size__ = 10000
+
+    # Folders scanned for extensions at startup, missing ones are skipped
+    __extension_folders__ = 'ext', 'events'
+
+    # Seconds of overlap re-read on each replica sync, covering modlogs that reached Mongo after newer ones
+    __replica_sync_overlap__ = 300
+
+    # Expired modlogs lifted at once, overall and per Discord rate-limit bucket (the guild's bans, or a channel)
+    __enforcement_concurrency__ = 10
+    __enforcement_bucket_concurrency__ = 2
 
     def __init__(self) -> None:
         intents = Intents.all()
@@ -70,23 +96,46 @@ class CustomBot(commands.Bot):
         )
 
         self.start_time: datetime = self.now
+        self.startup_phases: dict[str, float] = {}
+        self.__startup_clock: float = perf_counter()
 
         self.guild_id: int = GUILD_ID
         self.guild: Guild | None = None
 
         self.owners: list[User] = []
 
-        self.bans: list[int] = []
+        self.bans: set[int] = set()
+        self.__ban_changes: dict[int, bool] | None = None
         self.PERM_DURATION: int = 2 ** 32 - 1
 
         self.mongo: MongoDBClient | None = None
         self.mee6: MEE6APIClient | None = None
 
         self.metadata: MetaData | None = None
-
-        self.LOOPS: tuple[tasks.Loop, ...] = self.manage_modlogs, self.init_status
+        self.clearance_cache: OrderedDict[int, int] = OrderedDict()
+
+        self.scheduler: ExpiryScheduler = ExpiryScheduler(self)
+        self.replica: ModlogReplica | None = None
+        self.levels: LevelSync = LevelSync(self)
+        self.tracebacks: TracebackStore = TracebackStore(self)
+        self.role_toggles: RoleToggleCoalescer = RoleToggleCoalescer(self)
+
+        self.metrics: MetricsRegistry = MetricsRegistry()
+        self.instrument_http()
+
+        self.LOOPS: tuple[tasks.Loop, ...] = (
+            self.manage_modlogs,
+            self.reconcile_modlogs,
+            self.sync_replica,
+            self.sync_bans,
+            self.sync_levels,
+            self.init_owners,
+            self.init_status
+        )
 
         self.add_check(self.enforce_clearance, call_once=True)
+        self.before_invoke(self.start_command_timer)
+        self.after_invoke(self.stop_command_timer)
 
     async def __aexit__(
         self,
@@ -100,6 +149,23 @@ class CustomBot(commands.Bot):
 
         return await super().__aexit__(exc_type, exc_val, exc_tb)
 
+    def instrument_http(self) -> None:
+        request = self.http.request
+
+        async def instrumented_request(route: Route, **kwargs: Any) -> Any:
+            with self.metrics.time('discord_http_seconds', route=f'{route.method} {route.path}'):
+                return await request(route, **kwargs)
+
+        self.http.request = instrumented_request
+
+    async def start_command_timer(self, ctx: CustomContext, /) -> None:
+        ctx.started_at = perf_counter()
+
+    async def stop_command_timer(self, ctx: CustomContext, /) -> None:
+        status = 'failed' if ctx.command_failed is True else 'ok'
+        self.metrics.observe('command_seconds', perf_counter() - ctx.started_at, command=ctx.command.qualified_name)
+        self.metrics.inc('commands_total', command=ctx.command.qualified_name, status=status)
+
     @property
     def now(self) -> datetime:
         return datetime.now(tz=timezone.utc)
@@ -113,9 +179,8 @@ class CustomBot(commands.Bot):
             return '**`Member`**'
         elif clearance >= 9:
             return '**`Owner`**'
-        roles = 'helper', 'tmod', 'rmod', 'smod', 'hmod', 'senior', 'bot', 'admin'
-        clearance_map = {roles.index(role) + 1: getattr(self.metadata, f'{role}_role_id', None) for role in roles}
-        role_id = clearance_map.get(clearance)
+        role = self.metadata.__clearance_roles__[clearance - 1]
+        role_id = getattr(self.metadata, f'{role}_role_id', None)
         return f'**`None`**' if role_id is None else f'<@&{role_id}>'
 
     def convert_duration(self, duration: str, /, *, allow_any: bool = False) -> timedelta:
@@ -135,29 +200,10 @@ class CustomBot(commands.Bot):
 
     @staticmethod
     def fields_to_embeds(fields: Iterable[EmbedField], /, **kwargs: Any) -> list[CustomEmbed]:
-        def new_embed() -> CustomEmbed:
-            return CustomEmbed(
-                title=kwargs.get('title'),
-                colour=kwargs.get('colour'),
-                description=kwargs.get('description'),
-                timestamp=kwargs.get('timestamp')
-            )
-
-        embeds: list[CustomEmbed] = [new_embed()]
-        field_limit: int = kwargs.get('field_limit', 6)
-
-        for field in fields:
-            if len(embeds[-1].fields) >= field_limit or len(embeds[-1]) + len(field) > 6000:
-                embeds.append(new_embed())
-            embeds[-1].add_custom_field(field)
-
-        author_name = kwargs.get('author_name')
-        author_icon = kwargs.get('author_icon')
-
-        for embed in embeds:
-            embed.set_footer(text=f'Page {embeds.index(embed) + 1} of {len(embeds)}')
-            if author_name is not None and author_icon is not None:
-                embed.set_author(name=author_name, icon_url=author_icon)
+        embeds = list(iter_embeds(fields, **kwargs))
+
+        for page, embed in enumerate(embeds, start=1):
+            embed.set_footer(text=f'Page {page} of {len(embeds)}')
 
         return embeds
 
@@ -188,73 +234,228 @@ class CustomBot(commands.Bot):
             if raise_exception is True:
                 raise
 
-    async def member_clearance(self, member: Member | User, /) -> int:
-        if member in self.owners or member == self.guild.owner:
+    def invalidate_clearance(self, member_id: int | None = None, /) -> None:
+        if member_id is None:
+            self.clearance_cache.clear()
+        else:
+            self.clearance_cache.pop(member_id, None)
+
+    def compute_clearance(self, member: Member | User, /) -> int | None:
+        # `None` when the user's roles can't be resolved; that isn't cached, unlike a member with no clearance
+        if member.id in self.owner_ids or member.id == self.guild.owner_id:
             return 9
-        elif isinstance(member, User):
-            try:
-                member = await self.user_to_member(member, raise_exception=True)
-            except HTTPException:
-                return 0
+        elif not isinstance(member, Member):
+            # The guild from `fetch_guild` has no member cache, so resolve through the gateway's guild
+            guild = self.get_guild(self.guild_id)
+            member = guild.get_member(member.id) if guild is not None else None
+            if member is None:
+                return None
 
-        role_ids = [role.id for role in member.roles]
-        data = self.metadata
+        role_clearances = self.metadata.role_clearances
+        return max((role_clearances.get(role.id, 0) for role in member.roles), default=0)
+
+    async def member_clearance(self, member: Member | User, /) -> int:
+        try:
+            clearance = self.clearance_cache[member.id]
+        except KeyError:
+            clearance = self.compute_clearance(member)
+            if clearance is None:
+                return 0
 
-        return \
-            8 if data.admin_role_id in role_ids else  \
-            7 if data.bot_role_id in role_ids else    \
-            6 if data.senior_role_id in role_ids else \
-            5 if data.hmod_role_id in role_ids else   \
-            4 if data.smod_role_id in role_ids else   \
-            3 if data.rmod_role_id in role_ids else   \
-            2 if data.tmod_role_id in role_ids else   \
-            1 if data.helper_role_id in role_ids else 0
+            self.clearance_cache[member.id] = clearance
+            if len(self.clearance_cache) > self.__clearance_cache_size__:
+                self.clearance_cache.popitem(last=False)
+        else:
+            self.clearance_cache.move_to_end(member.id)
+        return clearance
 
     async def check_target_member(self, member: Member | User, /) -> None:
         clearance = await self.member_clearance(member)
         if clearance > 0:
             raise commands.CheckFailure('The target of this moderation is protected.')
 
-    @tasks.loop(minutes=1)
+    @tasks.loop()
     async def manage_modlogs(self) -> None:
         await self.wait_until_ready()
+        await self.scheduler.wait()
 
         self.guild = self.get_guild(self.guild_id) or self.guild
 
-        try:
-            active_modlogs = await self.mongo.search_modlog(active=True, deleted=False)
-        except ModlogNotFound:
+        # The scheduler only decides when to wake up; the replica decides what has expired, so drift is self-correcting
+        with self.metrics.time('expiry_sweep_seconds'):
+            now = self.now.timestamp()
+            expired_modlogs = self.replica.expired(now)
+
+            if expired_modlogs:
+                # Lifted cases are unscheduled by `deactivate_modlogs`
+                await self.lift_modlogs(expired_modlogs)
+
+            # Anything else the scheduler thought was due disagrees with the replica, so is re-armed from it
+            for case_id in self.scheduler.overdue(now):
+                expiry = self.replica.expiry(case_id)
+                if expiry is None:
+                    self.scheduler.unschedule(case_id)
+                else:
+                    self.scheduler.schedule(case_id, expiry)
+
+        self.metrics.inc('expiry_sweeps_total')
+        self.metrics.inc('expired_modlogs_total', len(expired_modlogs))
+
+    async def lift_modlog(self, modlog: ExpiredModlog, /) -> None:
+        if modlog.type == 'ban':
+            await self.guild.unban(Object(id=modlog.user_id))
+
+        elif modlog.type == 'channel_ban':
+            channel = self.get_channel(modlog.channel_id) or await self.fetch_channel(modlog.channel_id)
+            member = await self.user_to_member(Object(id=modlog.user_id), raise_exception=True)
+            await channel.set_permissions(member, view_channel=None)
+
+    async def lift_modlogs(self, modlogs: list[ExpiredModlog], /) -> dict[int, str | None]:
+        limit = Semaphore(self.__enforcement_concurrency__)
+        buckets: dict[tuple[str, int], Semaphore] = {}
+
+        async def lift(modlog: ExpiredModlog, /) -> str | None:
+            bucket = modlog.type, modlog.channel_id
+            if bucket not in buckets:
+                buckets[bucket] = Semaphore(self.__enforcement_bucket_concurrency__)
+
+            async with buckets[bucket], limit:
+                try:
+                    await self.lift_modlog(modlog)
+                except HTTPException as error:
+                    _logger.error(f'Failed to resolve expired modlog (Case ID: {modlog.case_id}) - {error}')
+                    return str(error)
+
+        errors = await gather(*map(lift, modlogs))
+        results = {modlog.case_id: error for modlog, error in zip(modlogs, errors)}
+
+        # Cases are closed even if lifting failed, matching the behaviour for a single case
+        await self.mongo.deactivate_modlogs(list(results))
+
+        failed = sum(error is not None for error in errors)
+        _logger.info(f'Resolved {len(results)} expired modlog(s) - {len(results) - failed} lifted, {failed} failed')
+        return results
+
+    @tasks.loop(hours=6)
+    async def reconcile_modlogs(self) -> None:
+        # The scheduler, cache and replica are kept up to date by `MongoDBClient`, this only guards against drift
+        cache = self.mongo.cache
+
+        self.scheduler.begin_reload()
+        cache.begin_reload()
+
+        synced_at = self.now.timestamp()
+        active_modlogs = await self.mongo.fetch_modlogs(active=True)
+
+        self.scheduler.load(
+            (modlog.case_id, modlog.until.timestamp()) for modlog in active_modlogs if modlog.deleted is False
+        )
+        cache.load(active_modlogs)
+        self.replica.replace(active_modlogs)
+        # A full reload is a snapshot, so incremental syncs can carry on from when it started
+        self.replica.mark_synced(watermark=synced_at, synced_at=synced_at)
+
+        _logger.info(
+            f'Modlogs reconciled - {len(self.scheduler)} expiry(s) scheduled - '
+            f'{len(cache)} modlog(s) cached ({cache.hits} hit(s), {cache.misses} miss(es)) - '
+            f'{len(self.replica)} active modlog(s) replicated'
+        )
+
+    @tasks.loop(seconds=30)
+    async def sync_replica(self) -> None:
+        now = self.now.timestamp()
+        replica = self.replica
+
+        # A fresh replica is seeded by `reconcile_modlogs` from active modlogs, rather than replaying every change
+        if replica.watermark == 0:
             return
 
-        for modlog in active_modlogs:
-            if modlog.is_expired is False:
-                continue
+        try:
+            changes = await self.mongo.get_modlog_changes(max(replica.watermark - self.__replica_sync_overlap__, 0))
+        except PyMongoError as error:
+            _logger.warning(f'Modlog replica not synced, last synced {replica.staleness(now):.0f}s ago - {error}')
+        else:
+            replica.apply(changes)
+            self.mongo.cache.invalidate(changes)
+            replica.mark_synced(watermark=max((entry['updated'] for entry in changes), default=0), synced_at=now)
 
-            try:
-                user = self.get_user(modlog.user_id) or await self.fetch_user(modlog.user_id)
+        self.metrics.set('modlog_replica_staleness_seconds', replica.staleness(now))
+        self.metrics.set('modlog_replica_watermark', replica.watermark)
+        self.metrics.set('modlog_replica_size', len(replica))
 
-                if modlog.type == 'ban':
-                    await self.guild.unban(user)
+    @tasks.loop(count=1)
+    async def sync_bans(self) -> None:
+        await self.wait_until_ready()
 
-                elif modlog.type == 'channel_ban':
-                    channel = self.get_channel(modlog.channel_id) or await self.fetch_channel(modlog.channel_id)
-                    member = await self.user_to_member(user, raise_exception=True)
-                    await channel.set_permissions(member, view_channel=None)
+        # Ban events received mid-walk may or may not be reflected in the pages already fetched
+        self.__ban_changes = {}
+        try:
+            bans = {entry.user.id async for entry in self.guild.bans(limit=None)}
+        finally:
+            changes, self.__ban_changes = self.__ban_changes, None
 
-            except HTTPException as error:
-                _logger.error(f'Failed to resolve expired modlog (Case ID: {modlog.case_id}) - {error}')
+        for user_id, banned in changes.items():
+            if banned is True:
+                bans.add(user_id)
+            else:
+                bans.discard(user_id)
 
-            await self.mongo.update_modlog(_case_id=modlog.case_id, active=False)
+        added, removed = bans - self.bans, self.bans - bans
+        self.bans = bans
+
+        await self.mongo.sync_bans(added, removed)
+        _logger.info(f'Guild bans reconciled - {len(bans)} total, {len(added)} added, {len(removed)} removed')
+
+    @tasks.loop(minutes=30)
+    async def sync_levels(self) -> None:
+        await self.wait_until_ready()
+
+        if not self.metadata.level_roles and self.metadata.active_role_id is None:
+            return
+
+        self.guild = self.get_guild(self.guild_id) or self.guild
+        await self.levels.sync()
+
+    @tasks.loop(count=1)
+    async def init_owners(self) -> None:
+        await self.wait_until_ready()
+
+        # Only used for display, so resolved from the cache where possible instead of delaying startup
+        missing = [user_id for user_id in OWNER_IDS if self.get_user(user_id) is None]
+        fetched = {user.id: user for user in await gather(*map(self.fetch_user, missing))}
+        self.owners = [self.get_user(user_id) or fetched[user_id] for user_id in OWNER_IDS]
+        _logger.info(f'Owner(s): {", ".join(owner.name for owner in self.owners)}')
 
     @tasks.loop(count=1)
     async def init_status(self) -> None:
         await self.wait_until_ready()
         await self.change_presence(activity=Activity(type=ActivityType.listening, name=self.metadata.activity))
 
+    async def filter_links(self, message: Message, /) -> bool:
+        host = self.metadata.domain_matcher.find(message.content)
+        if host is None:
+            return False
+
+        try:
+            await message.delete()
+            await self.bad_embed(message.channel, f'❌ {message.author.mention}, links to `{host}` are not allowed.')
+        except HTTPException as error:
+            _logger.error(f'Failed to remove blacklisted link from message {message.id} - {error}')
+
+        return True
+
     async def on_message(self, message: Message, /) -> None:
         if message.guild is None or message.guild != self.guild or message.author.bot is True:
             return
 
+        if not self.metadata.ignores_automod(message) and await self.filter_links(message):
+            return
+
+        # Most messages aren't commands; don't build a context for them
+        prefix = await self.get_prefix(message)
+        if not message.content.startswith(prefix if isinstance(prefix, str) else tuple(prefix)):
+            return
+
         ctx = await self.get_context(message, cls=CustomContext)
         await self.invoke(ctx)
 
@@ -262,13 +463,17 @@ class CustomBot(commands.Bot):
         if member.guild != self.guild:
             return
 
-        try:
-            member_modlogs = await self.mongo.search_modlog(user_id=member.id, active=True, deleted=False)
-        except ModlogNotFound:
-            return
+        self.invalidate_clearance(member.id)
+
+        # Served from the cache, with the replica behind it, so members can't dodge punishments by re-joining while
+        # Mongo is unreachable
+        modlogs = self.mongo.cache.search(user_id=member.id, active=True, deleted=False)
+        if modlogs is None:
+            modlogs = self.replica.for_user(member.id)
 
-        for modlog in member_modlogs:
-            if modlog.is_expired is True:
+        now = self.now
+        for modlog in modlogs:
+            if modlog.until < now:
                 continue
 
             try:
@@ -282,6 +487,48 @@ class CustomBot(commands.Bot):
             except HTTPException as error:
                 _logger.error(f'Failed to enforce case {modlog.case_id} on member re-join - {error}')
 
+    async def on_member_ban(self, guild: Guild, user: User | Member, /) -> None:
+        if guild != self.guild:
+            return
+
+        self.bans.add(user.id)
+        if self.__ban_changes is not None:
+            self.__ban_changes[user.id] = True
+
+        await self.mongo.add_ban(user.id)
+
+    async def on_member_unban(self, guild: Guild, user: User, /) -> None:
+        if guild != self.guild:
+            return
+
+        self.bans.discard(user.id)
+        if self.__ban_changes is not None:
+            self.__ban_changes[user.id] = False
+
+        await self.mongo.remove_ban(user.id)
+
+    async def on_member_remove(self, member: Member, /) -> None:
+        self.invalidate_clearance(member.id)
+
+    async def on_member_update(self, before: Member, after: Member, /) -> None:
+        if before.roles != after.roles:
+            self.invalidate_clearance(after.id)
+
+    async def on_guild_role_delete(self, _: Role, /) -> None:
+        self.invalidate_clearance()
+
+    async def on_resumed(self) -> None:
+        # Member and role updates may have been missed while disconnected
+        self.invalidate_clearance()
+
+    async def on_guild_available(self, guild: Guild, /) -> None:
+        if guild.id == self.guild_id:
+            self.invalidate_clearance()
+
+    async def on_guild_update(self, before: Guild, after: Guild, /) -> None:
+        if before.owner_id != after.owner_id:
+            self.invalidate_clearance()
+
     # TODO: `all_command_names` method
 
     async def on_command_error(self, ctx: CustomContext, error: commands.CommandError, /) -> None:
@@ -319,18 +566,8 @@ class CustomBot(commands.Bot):
         if reset_cooldown is True:
             ctx.command.reset_cooldown(ctx)
 
-        sent = await self.bad_embed(ctx, f'❌ {message}')
-
-        traceback = ''.join(format_exception(type(error), error, error.__traceback__))
-        if len(traceback) > 1960:
-            traceback = '\n'.join(traceback[-1960:].split('\n')[1:])
-            note = ' (Last 2,000)'
-        else:
-            note = ''
-        traceback = f'**Traceback{note}:**\n```\n{traceback}\n```'
-
-        view = TracebackView(self, sent, traceback)
-        await sent.edit(view=view)
+        record = self.tracebacks.record(error)
+        await self.bad_embed(ctx, f'❌ {message}', view=TracebackView(record.fingerprint))
 
     async def send_command_help(self, ctx: CustomContext, command: commands.Command, /) -> None:
         requirement = command.extras.get('requirement', 0)
@@ -362,52 +599,103 @@ class CustomBot(commands.Bot):
         )
         await ctx.send(embed=help_embed)
 
+    @contextmanager
+    def startup_phase(self, name: str, /) -> Iterator[None]:
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.startup_phases[name] = elapsed = perf_counter() - start
+            self.metrics.set('startup_phase_seconds', elapsed, phase=name)
+
+    def iter_extensions(self) -> Iterator[str]:
+        for folder in self.__extension_folders__:
+            if not isdir(folder):
+                _logger.debug(f'Extension folder {folder} not found, skipping')
+                continue
+
+            for file in sorted(listdir(folder)):
+                if file.endswith('.py'):
+                    yield f'{folder}.{file[:-3]}'
+
+    async def load_extensions(self) -> None:
+
+        async def load(extension: str, /) -> None:
+            try:
+                await self.load_extension(extension)
+            except (commands.ExtensionFailed, commands.NoEntryPointError) as extension_error:
+                _logger.error(f'Extension {extension} could not be loaded: {extension_error}')
+
+        with self.startup_phase('extensions'):
+            await gather(*map(load, self.iter_extensions()))
+
     async def setup_hook(self) -> None:
         _logger.info(f'Logging in as {self.user.name} (ID: {self.user.id})...')
 
-        try:
-            self.owners = [await self.fetch_user(user_id) for user_id in OWNER_IDS]
-            self.guild = await self.fetch_guild(self.guild_id)
-        except HTTPException as error:
-            _logger.fatal(error)
-            _logger.fatal('Please double-check your config.py file is correct.')
-            raise SystemExit()
+        with self.startup_phase('setup'):
+            try:
+                # The ban snapshot is reconciled against the guild in the background by `sync_bans`
+                self.guild, self.bans, self.metadata = await gather(
+                    self.fetch_guild(self.guild_id),
+                    self.mongo.get_bans(),
+                    self.mongo.get_metadata()
+                )
+            except HTTPException as error:
+                _logger.fatal(error)
+                _logger.fatal('Please double-check your config.py file is correct.')
+                raise SystemExit()
 
-        _logger.info(f'Owner(s): {", ".join(owner.name for owner in self.owners)}')
-        _logger.info(f'Guild: {self.guild.name}')
+            _logger.info(f'Guild: {self.guild.name}')
+            _logger.info(f'Loaded {len(self.bans)} guild ban(s) from snapshot')
 
-        _logger.info('Fetching guild bans, this may take a while...')
-        self.bans = [entry.user.id async for entry in self.guild.bans(limit=None)]
+            # Persistent button routing by custom ID; no per-message views need re-registering after a restart
+            self.add_dynamic_items(TracebackButton, RoleButton)
 
-        self.metadata = await self.mongo.get_metadata()
-        # TODO: Set view listeners
+            for loop in self.LOOPS:
+                loop.add_exception_type(Exception)
+                loop.start()
 
-        for loop in self.LOOPS:
-            loop.add_exception_type(Exception)
-            loop.start()
+    async def on_ready(self) -> None:
+        # Also dispatched on every reconnect, only the first one is part of startup
+        if 'ready' in self.startup_phases:
+            self.invalidate_clearance()
+            return
+
+        self.startup_phases['ready'] = elapsed = perf_counter() - self.__startup_clock
+        self.metrics.set('startup_phase_seconds', elapsed, phase='ready')
+
+        breakdown = ', '.join(f'{phase} {seconds * 1000:.0f}ms' for phase, seconds in self.startup_phases.items())
+        _logger.info(f'Ready in {elapsed:.2f}s ({breakdown})')
 
     def run_bot(self) -> None:
 
         async def runner() -> None:
-            async with self:
-                async with MongoDBClient(self, MONGO) as self.mongo, MEE6APIClient() as self.mee6:
-
-                    for folder in ('./ext', './events'):
-                        for file in listdir(folder):
-                            if file.endswith('.py'):
-
-                                extension = f'{folder[2:]}.{file[:-3]}'
-                                try:
-                                    await self.load_extension(extension)
-                                except (commands.ExtensionFailed, commands.NoEntryPointError) as extension_error:
-                                    _logger.error(f'Extension {extension} could not be loaded: {extension_error}')
-
-                    try:
-                        await self.start(TOKEN)
-                    except LoginFailure:
-                        _logger.fatal('Invalid token passed.')
-                    except PrivilegedIntentsRequired:
-                        _logger.fatal('Intents are being requested that have not been enabled in the developer portal.')
+            async with self, AsyncExitStack() as stack:
+                # Extensions don't touch the database or MEE6, so they load while those connect
+                extensions = create_task(self.load_extensions())
+
+                try:
+                    with self.startup_phase('connect'):
+                        self.replica = ModlogReplica(MODLOG_REPLICA)
+                        stack.callback(self.replica.close)
+                        self.mongo = await stack.enter_async_context(
+                            MongoDBClient(self, MONGO, journal=MODLOG_JOURNAL)
+                        )
+                        self.mee6 = await stack.enter_async_context(MEE6APIClient(self.guild_id))
+                        await stack.enter_async_context(MetricsServer(self.metrics, METRICS_PORT))
+                except BaseException:
+                    # Not left pending if connecting fails first; an error it already raised is still reported
+                    extensions.cancel()
+                    raise
+
+                await extensions
+
+                try:
+                    await self.start(TOKEN)
+                except LoginFailure:
+                    _logger.fatal('Invalid token passed.')
+                except PrivilegedIntentsRequired:
+                    _logger.fatal('Intents are being requested that have not been enabled in the developer portal.')
 
         try:
             run(runner())
@@ -421,6 +709,8 @@ class CustomContext(commands.Context[CustomBot]):
 
     __enduring_log_types__ = 'mute', 'ban', 'channel_ban'
 
+    started_at: float = 0.0
+
     async def author_clearance(self) -> int:
         return await self.bot.member_clearance(self.author)
 
@@ -441,7 +731,8 @@ class CustomContext(commands.Context[CustomBot]):
             channel_id=channel_id,
             type=self.command.callback.__name__,
             reason=reason,
-            created=self.bot.now,
+            # Stored in whole seconds; truncated here so `until` matches the stored `expires_at` exactly
+            created=self.bot.now.replace(microsecond=0),
             duration=duration,
             received=received,
             deleted=False,
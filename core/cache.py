@@ -0,0 +1,173 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+from collections import OrderedDict
+from dataclasses import replace
+
+if TYPE_CHECKING:
+    from typing import Any
+    from collections.abc import Iterable
+
+    from core.modlog import Modlog
+
+    UserKey = tuple[int, bool, bool]
+
+
+class ModlogCache:
+
+    # Active modlogs are always resident; only inactive ones are subject to eviction
+    __max_inactive__ = 5000
+
+    __searchable__ = frozenset({
+        'case_id', 'user_id', 'mod_id', 'channel_id', 'type', 'reason', 'received', 'deleted', 'active'
+    })
+
+    def __init__(self) -> None:
+        self._modlogs: dict[int, Modlog] = {}
+        self._by_user: dict[UserKey, set[int]] = {}
+
+        self._active: set[int] = set()
+        self._inactive: OrderedDict[int, None] = OrderedDict()
+
+        # True once every active modlog is known to be resident, i.e. active searches can skip the database
+        self.primed: bool = False
+        self._touched: set[int] | None = None
+
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def __len__(self) -> int:
+        return len(self._modlogs)
+
+    def __contains__(self, case_id: int, /) -> bool:
+        return case_id in self._modlogs
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    @staticmethod
+    def user_key(modlog: Modlog, /) -> UserKey:
+        return modlog.user_id, modlog.active, modlog.deleted
+
+    def _remove(self, case_id: int, /) -> None:
+        modlog = self._modlogs.pop(case_id, None)
+        if modlog is None:
+            return
+
+        key = self.user_key(modlog)
+        case_ids = self._by_user.get(key)
+        if case_ids is not None:
+            case_ids.discard(case_id)
+            if not case_ids:
+                del self._by_user[key]
+
+        self._active.discard(case_id)
+        self._inactive.pop(case_id, None)
+
+    def _add(self, modlog: Modlog, /) -> None:
+        self._remove(modlog.case_id)
+
+        self._modlogs[modlog.case_id] = modlog
+        self._by_user.setdefault(self.user_key(modlog), set()).add(modlog.case_id)
+
+        if modlog.active is True:
+            self._active.add(modlog.case_id)
+        else:
+            self._inactive[modlog.case_id] = None
+            if len(self._inactive) > self.__max_inactive__:
+                self._remove(next(iter(self._inactive)))
+
+    def put(self, modlog: Modlog, /) -> None:
+        if self._touched is not None:
+            self._touched.add(modlog.case_id)
+        self._add(modlog)
+
+    def discard(self, case_id: int, /) -> None:
+        if self._touched is not None:
+            self._touched.add(case_id)
+        self._remove(case_id)
+
+    def update(self, case_id: int, /, **changes: Any) -> None:
+        modlog = self._modlogs.get(case_id)
+        if modlog is not None:
+            self.put(replace(modlog, **changes))
+
+    def invalidate(self, documents: Iterable[dict[str, Any]], /) -> None:
+        # Takes the partial documents read by the replica sync; changes made through this client are already
+        # resident, anything else can't be rebuilt from them so is dropped until the next reload
+        for document in documents:
+            modlog = self._modlogs.get(document['case_id'])
+            if modlog is not None and (modlog.active, modlog.deleted) == (document['active'], document['deleted']):
+                continue
+
+            if document['active'] is True and document['deleted'] is False:
+                self.primed = False
+            self._remove(document['case_id'])
+
+    def get(self, case_id: int, /) -> Modlog | None:
+        modlog = self._modlogs.get(case_id)
+
+        if modlog is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        if case_id in self._inactive:
+            self._inactive.move_to_end(case_id)
+        return modlog
+
+    def begin_reload(self) -> None:
+        self._touched = set()
+
+    def load(self, modlogs: Iterable[Modlog], /) -> None:
+        touched = self._touched or set()
+        self._touched = None
+
+        fresh = {modlog.case_id: modlog for modlog in modlogs if modlog.case_id not in touched}
+
+        for case_id in list(self._active):
+            if case_id not in touched and case_id not in fresh:
+                self._remove(case_id)
+        for modlog in fresh.values():
+            self._add(modlog)
+
+        self.primed = True
+
+    def search(self, **kwargs: Any) -> list[Modlog] | None:
+        # Returns None whenever the cache cannot prove that its answer is complete
+        if any(key not in self.__searchable__ or isinstance(value, dict) for key, value in kwargs.items()):
+            self.misses += 1
+            return None
+
+        if 'case_id' in kwargs:
+            modlog = self.get(kwargs['case_id'])
+            if modlog is None:
+                return None
+            candidates = [modlog.case_id]
+
+        elif kwargs.get('active') is True and self.primed is True:
+            self.hits += 1
+            user_id = kwargs.get('user_id')
+
+            if user_id is None:
+                candidates = self._active
+            elif 'deleted' in kwargs:
+                candidates = self._by_user.get((user_id, True, kwargs['deleted']), ())
+            else:
+                candidates = (
+                    *self._by_user.get((user_id, True, False), ()),
+                    *self._by_user.get((user_id, True, True), ())
+                )
+
+        else:
+            self.misses += 1
+            return None
+
+        modlogs = [
+            modlog for modlog in map(self._modlogs.__getitem__, candidates)
+            if all(getattr(modlog, key) == value for key, value in kwargs.items())
+        ]
+        modlogs.sort(key=lambda modlog: modlog.case_id)
+        return modlogs
@@ -1,12 +1,27 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING
 
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 
 from discord import Embed
 
 if TYPE_CHECKING:
     from typing import Any, Self
+    from collections.abc import Iterable, Iterator
+
+
+# Discord's embed limits
+TOTAL_LIMIT = 6000
+FIELD_COUNT_LIMIT = 25
+TITLE_LIMIT = 256
+DESCRIPTION_LIMIT = 4096
+FIELD_NAME_LIMIT = 256
+FIELD_VALUE_LIMIT = 1024
+FOOTER_LIMIT = 2048
+AUTHOR_NAME_LIMIT = 256
+
+# Room left for a `Page X of Y` footer, which is only known once every field has been packed
+FOOTER_RESERVE = 32
 
 
 @dataclass(kw_only=True, slots=True, frozen=True)
@@ -19,6 +34,12 @@ class EmbedField:
     def __len__(self) -> int:
         return len(str(self.name)) + len(str(self.value))
 
+    def truncated(self) -> Self:
+        name, value = str(self.name), str(self.value)
+        if len(name) <= FIELD_NAME_LIMIT and len(value) <= FIELD_VALUE_LIMIT:
+            return self
+        return replace(self, name=name[:FIELD_NAME_LIMIT], value=value[:FIELD_VALUE_LIMIT])
+
 
 class CustomEmbed(Embed):
 
@@ -32,3 +53,63 @@ class CustomEmbed(Embed):
             self._fields.reverse()
         except AttributeError:
             pass
+
+
+def pack_fields(
+    fields: Iterable[EmbedField],
+    /, *,
+    field_limit: int = 6,
+    base_size: int = 0
+) -> Iterator[list[EmbedField]]:
+    # Running totals keep this linear in the number of fields; `base_size` covers everything but the fields
+    # Always yields at least one (possibly empty) page
+    field_limit = min(field_limit, FIELD_COUNT_LIMIT)
+    budget = TOTAL_LIMIT - base_size
+
+    page: list[EmbedField] = []
+    size = 0
+
+    for field in fields:
+        field = field.truncated()
+        length = len(field)
+
+        if page and (len(page) >= field_limit or size + length > budget):
+            yield page
+            page, size = [], 0
+
+        page.append(field)
+        size += length
+
+    yield page
+
+
+def iter_embeds(fields: Iterable[EmbedField], /, **kwargs: Any) -> Iterator[CustomEmbed]:
+    title = kwargs.get('title')
+    description = kwargs.get('description')
+    author_name = kwargs.get('author_name')
+    author_icon = kwargs.get('author_icon')
+
+    title = title[:TITLE_LIMIT] if title is not None else None
+    description = description[:DESCRIPTION_LIMIT] if description is not None else None
+    author_name = author_name[:AUTHOR_NAME_LIMIT] if author_name is not None else None
+
+    base_size = len(title or '') + len(description or '') + FOOTER_RESERVE
+    if author_name is not None and author_icon is not None:
+        base_size += len(author_name)
+
+    pages = pack_fields(fields, field_limit=kwargs.get('field_limit', 6), base_size=base_size)
+
+    for page in pages:
+        embed = CustomEmbed(
+            title=title,
+            colour=kwargs.get('colour'),
+            description=description,
+            timestamp=kwargs.get('timestamp')
+        )
+        if author_name is not None and author_icon is not None:
+            embed.set_author(name=author_name, icon_url=author_icon)
+
+        for field in page:
+            embed.add_custom_field(field)
+
+        yield embed
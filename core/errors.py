@@ -22,3 +22,13 @@ class ModlogNotFound(Exception):
     def __str__(self) -> str:
         formatted_kwargs = ', '.join(f'{key}={value}' for key, value in self.kwargs.items())
         return f'No modlogs matching the following search parameters were found: `{formatted_kwargs}`'
+
+
+class MEE6APIError(Exception):
+
+    def __init__(self, status: int, message: str, /) -> None:
+        self.status: int = status
+        self.message: str = message
+
+    def __str__(self) -> str:
+        return f'MEE6 API request failed with status {self.status}: {self.message}'
@@ -0,0 +1,94 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+from asyncio import Lock, to_thread
+from json import dumps, loads, JSONDecodeError
+from logging import getLogger
+from os import fsync
+
+if TYPE_CHECKING:
+    from typing import Any, TextIO
+
+    Dict = dict[str, Any]
+
+
+_logger = getLogger(__name__)
+
+
+class ModlogJournal:
+
+    # Append-only JSON lines: one line per modlog document, and `{"ack": [case_id, ...]}` once documents reach Mongo.
+    # Every append is fsynced before returning; concurrent appends share a single write and fsync (group commit).
+
+    def __init__(self, path: str, /) -> None:
+        self.path: str = path
+
+        self.__file: TextIO | None = None
+        self.__lock: Lock = Lock()
+        self.__buffer: list[str] = []
+        self.__appended: int = 0
+        self.__synced: int = 0
+
+    def open(self) -> list[Dict]:
+        # Returns the documents that were journalled but never acknowledged, in order
+        pending: dict[int, Dict] = {}
+        line = '\n'
+
+        try:
+            with open(self.path, encoding='utf-8') as file:
+                for number, line in enumerate(file, start=1):
+                    try:
+                        record = loads(line)
+                    except JSONDecodeError:
+                        # Only the final line can be torn, by a crash mid-write
+                        _logger.warning(f'Skipping unreadable line {number} of modlog journal {self.path}')
+                        continue
+
+                    if 'ack' in record:
+                        for case_id in record['ack']:
+                            pending.pop(case_id, None)
+                    else:
+                        pending[record['case_id']] = record
+        except FileNotFoundError:
+            pass
+
+        self.__file = open(self.path, 'a', encoding='utf-8')
+        if not line.endswith('\n'):
+            # Terminate a torn final line, so the next record isn't appended to it
+            self.__file.write('\n')
+        return list(pending.values())
+
+    def close(self) -> None:
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+
+    def __write(self, lines: list[str], /) -> None:
+        self.__file.write(''.join(lines))
+        self.__file.flush()
+        fsync(self.__file.fileno())
+
+    async def append(self, *records: Dict) -> None:
+        self.__buffer.extend(f'{dumps(record, separators=(",", ":"))}\n' for record in records)
+        self.__appended += len(records)
+        target = self.__appended
+
+        async with self.__lock:
+            # An earlier holder of the lock may have already written these records along with its own
+            if self.__synced >= target:
+                return
+
+            lines, self.__buffer = self.__buffer, []
+            appended = self.__appended
+            await to_thread(self.__write, lines)
+            self.__synced = appended
+
+    async def ack(self, case_ids: list[int], /) -> None:
+        await self.append({'ack': case_ids})
+
+    async def compact(self) -> None:
+        # Only valid when nothing is pending; the whole journal is then redundant
+        async with self.__lock:
+            if self.__buffer:
+                return
+            await to_thread(self.__file.truncate, 0)
@@ -0,0 +1,122 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+from logging import getLogger
+
+from core.mee6 import TokenBucket
+
+from discord import HTTPException, Object
+
+if TYPE_CHECKING:
+    from typing import Any
+
+    from core.bot import CustomBot
+
+    Dict = dict[str, Any]
+
+
+_logger = getLogger(__name__)
+
+
+class LevelSync:
+
+    __checkpoint__ = 'mee6_leaderboard'
+
+    # Members lose the active role after this many seconds without gaining XP
+    __active_window__ = 604800
+
+    # Member edits per second (and burst) while applying role changes
+    __edit_rate__ = 1.0
+    __edit_burst__ = 5
+
+    def __init__(self, bot: CustomBot, /) -> None:
+        self.bot: CustomBot = bot
+        self.__edits: TokenBucket = TokenBucket(self.__edit_rate__, self.__edit_burst__)
+
+    def reward_roles(self, level: int, /) -> set[int]:
+        return {role_id for threshold, role_id in self.bot.metadata.level_roles.items() if int(threshold) <= level}
+
+    async def apply_roles(self, user_id: int, /, *, level: int | None = None, active: bool | None = None) -> bool:
+        # `None` leaves that part of the member's roles untouched; all changes go out in a single edit
+        member = self.bot.guild.get_member(user_id)
+        if member is None:
+            return False
+
+        current = {role.id for role in member.roles if role.id != self.bot.guild.id}
+        desired = set(current)
+
+        if level is not None:
+            desired -= set(self.bot.metadata.level_roles.values())
+            desired |= self.reward_roles(level)
+
+        active_role_id = self.bot.metadata.active_role_id
+        if active is not None and active_role_id is not None:
+            if active is True:
+                desired.add(active_role_id)
+            else:
+                desired.discard(active_role_id)
+
+        if desired == current:
+            return False
+
+        await self.__edits.acquire()
+        try:
+            await member.edit(roles=[Object(id=role_id) for role_id in desired], reason='MEE6 level sync')
+        except HTTPException as error:
+            _logger.error(f'Failed to sync level roles for member {user_id} - {error}')
+            return False
+        return True
+
+    async def sync(self) -> None:
+        mongo = self.bot.mongo
+        now = self.bot.now.timestamp()
+
+        checkpoint = await mongo.get_checkpoint(self.__checkpoint__) or {}
+        start = checkpoint.get('page', 0)
+        if start:
+            _logger.info(f'Resuming MEE6 leaderboard sync from page {start}')
+
+        changed = edited = 0
+
+        async for page, players in self.bot.mee6.iter_leaderboard(start=start):
+            snapshot = await mongo.get_levels([player.user_id for player in players])
+            entries: list[Dict] = []
+
+            for player in players:
+                previous = snapshot.get(player.user_id)
+                if previous is not None and previous['xp'] == player.xp:
+                    continue
+
+                # A player's first appearance isn't evidence of recent activity, only an XP increase is
+                gained = previous is not None and player.xp > previous['xp']
+                entries.append({
+                    '_id': player.user_id,
+                    'level': player.level,
+                    'xp': player.xp,
+                    'rank': player.rank,
+                    'last_gain': now if gained else (previous or {}).get('last_gain', 0),
+                    'active': gained or (previous or {}).get('active', False)
+                })
+
+                level_changed = previous is None or previous['level'] != player.level
+                edited += await self.apply_roles(
+                    player.user_id,
+                    level=player.level if level_changed else None,
+                    active=True if gained else None
+                )
+
+            await mongo.save_levels(entries)
+            await mongo.set_checkpoint(self.__checkpoint__, page=page + 1)
+            changed += len(entries)
+
+        lapsed = await mongo.get_lapsed_active_levels(now - self.__active_window__)
+        for entry in lapsed:
+            edited += await self.apply_roles(entry['_id'], active=False)
+            entry['active'] = False
+        await mongo.save_levels(lapsed)
+
+        await mongo.set_checkpoint(self.__checkpoint__, page=0, completed=now)
+        _logger.info(
+            f'MEE6 leaderboard synced - {changed} player(s) changed, {len(lapsed)} no longer active, '
+            f'{edited} member(s) edited'
+        )
@@ -1,16 +1,96 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING
 
+from asyncio import Lock, Task, create_task, shield, sleep
+from collections import deque
+from dataclasses import dataclass
+from logging import getLogger
+from time import monotonic
+
+from core.errors import MEE6APIError
+
+from aiohttp import ClientSession, ClientTimeout, ClientError
+
 if TYPE_CHECKING:
-    from typing import Self
+    from typing import Self, Any
     from types import TracebackType
+    from collections.abc import AsyncIterator, Awaitable, Callable
+
+
+_logger = getLogger(__name__)
+
+
+@dataclass(kw_only=True, slots=True, frozen=True)
+class MEE6Player:
+
+    user_id: int
+    level: int
+    xp: int
+    rank: int
+
+
+class TokenBucket:
+
+    def __init__(self, rate: float, capacity: int, /) -> None:
+        self.rate: float = rate
+        self.capacity: int = capacity
+
+        self.__tokens: float = capacity
+        self.__updated: float = monotonic()
+        self.__lock: Lock = Lock()
+
+    async def acquire(self) -> None:
+        # The lock keeps waiters in FIFO order, so a burst can't starve earlier callers
+        async with self.__lock:
+            while True:
+                now = monotonic()
+                self.__tokens = min(self.capacity, self.__tokens + (now - self.__updated) * self.rate)
+                self.__updated = now
+
+                if self.__tokens >= 1:
+                    self.__tokens -= 1
+                    return
+
+                await sleep((1 - self.__tokens) / self.rate)
 
 
 class MEE6APIClient:
 
-    async def __aenter__(self) -> Self:
-        ...
+    __base_url__ = 'https://mee6.xyz'
+    __page_size__ = 1000
+    __max_retries__ = 3
+
+    # Per-user level lookups are served from cache for this many seconds; a lookup that misses walks the leaderboard
+    # at most once per TTL, and that walk is shared by every lookup made meanwhile
+    __level_ttl__ = 300
 
+    def __init__(
+        self,
+        guild_id: int,
+        /, *,
+        base_url: str | None = None,
+        rate: float = 1.0,
+        burst: int = 3,
+        prefetch: int = 3
+    ) -> None:
+        self.guild_id: int = guild_id
+        self.base_url: str = base_url or self.__base_url__
+        self.prefetch: int = prefetch
+
+        self.__bucket: TokenBucket = TokenBucket(rate, burst)
+        self.__session: ClientSession | None = None
+
+        self.__inflight: dict[Any, Task] = {}
+        self.__levels: dict[int, tuple[float, MEE6Player]] = {}
+        # Until when the last complete leaderboard walk is fresh; anybody not cached by it isn't ranked
+        self.__leaderboard_until: float = 0.0
+
+    async def __aenter__(self) -> Self:
+        self.__session = ClientSession(
+            base_url=self.base_url,
+            timeout=ClientTimeout(total=15),
+            headers={'Accept': 'application/json'}
+        )
         return self
 
     async def __aexit__(
@@ -19,4 +99,118 @@ class MEE6APIClient:
         exc_val: BaseException | None,
         exc_tb: TracebackType | None
     ) -> None:
-        ...
+        for task in self.__inflight.values():
+            task.cancel()
+        if self.__session is not None:
+            await self.__session.close()
+
+    async def single_flight(self, key: Any, factory: Callable[[], Awaitable[Any]], /) -> Any:
+        # Identical requests that overlap share one underlying call; `shield` stops one caller's cancellation
+        # from cancelling it for everybody else
+        task = self.__inflight.get(key)
+        if task is None:
+            task = self.__inflight[key] = create_task(factory())
+            task.add_done_callback(lambda _: self.__inflight.pop(key, None))
+        return await shield(task)
+
+    async def request(self, path: str, /, **params: Any) -> Any:
+        for attempt in range(self.__max_retries__):
+            await self.__bucket.acquire()
+
+            try:
+                async with self.__session.get(path, params=params) as response:
+                    if response.status == 429:
+                        retry_after = float(response.headers.get('Retry-After', 2 ** attempt))
+                        _logger.warning(f'Rate limited by MEE6, retrying in {retry_after}s')
+                        await sleep(retry_after)
+                        continue
+
+                    if response.status >= 400:
+                        raise MEE6APIError(response.status, await response.text())
+
+                    return await response.json()
+
+            except ClientError as error:
+                if attempt == self.__max_retries__ - 1:
+                    raise MEE6APIError(0, str(error))
+                await sleep(2 ** attempt)
+
+        raise MEE6APIError(429, 'Rate limit retries exhausted.')
+
+    def cache_player(self, player: MEE6Player, /) -> None:
+        self.__levels[player.user_id] = monotonic() + self.__level_ttl__, player
+
+    async def leaderboard_page(self, page: int, /) -> list[MEE6Player]:
+        path = f'/api/plugins/levels/leaderboard/{self.guild_id}'
+        data = await self.single_flight(
+            ('leaderboard', page),
+            lambda: self.request(path, page=page, limit=self.__page_size__)
+        )
+
+        offset = page * self.__page_size__
+        players = [
+            MEE6Player(user_id=int(entry['id']), level=entry['level'], xp=entry['xp'], rank=offset + index + 1)
+            for index, entry in enumerate(data.get('players', []))
+        ]
+        for player in players:
+            self.cache_player(player)
+        return players
+
+    async def iter_leaderboard(
+        self,
+        *,
+        start: int = 0,
+        pages: int | None = None
+    ) -> AsyncIterator[tuple[int, list[MEE6Player]]]:
+        # Keeps up to `self.prefetch` pages in flight ahead of the consumer; the rate limiter still paces them
+        end = None if pages is None else start + pages
+        pending: deque[tuple[int, Task]] = deque()
+        next_page = start
+
+        def schedule() -> None:
+            nonlocal next_page
+            if end is None or next_page < end:
+                pending.append((next_page, create_task(self.leaderboard_page(next_page))))
+                next_page += 1
+
+        for _ in range(self.prefetch):
+            schedule()
+
+        try:
+            while pending:
+                page, task = pending.popleft()
+                players = await task
+                yield page, players
+
+                if len(players) < self.__page_size__:
+                    break
+                schedule()
+        finally:
+            for _, task in pending:
+                task.cancel()
+
+    async def refresh_leaderboard(self) -> None:
+        # Every page caches its players as it arrives
+        async for _ in self.iter_leaderboard():
+            pass
+
+        # Anything the walk didn't refresh has expired, which keeps the cache to roughly the leaderboard's size
+        now = monotonic()
+        self.__levels = {user_id: cached for user_id, cached in self.__levels.items() if cached[0] > now}
+        self.__leaderboard_until = now + self.__level_ttl__
+
+    async def get_player(self, user_id: int, /) -> MEE6Player | None:
+        cached = self.__levels.get(user_id)
+        if cached is not None and cached[0] > monotonic():
+            return cached[1]
+
+        if self.__leaderboard_until <= monotonic():
+            await self.single_flight('leaderboard', self.refresh_leaderboard)
+
+        # Users without any XP aren't on the leaderboard
+        cached = self.__levels.get(user_id)
+        return cached[1] if cached is not None else None
+
+    async def get_level(self, user_id: int, /) -> int:
+        player = await self.get_player(user_id)
+        return player.level if player is not None else 0
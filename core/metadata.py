@@ -1,15 +1,23 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+from core.automod import compile_domains
 
 if TYPE_CHECKING:
     from core.bot import CustomBot
+    from core.automod import DomainMatcher
+
+    from discord import Message
 
 
 @dataclass(kw_only=True, slots=True, frozen=True)
 class MetaData:
 
+    # Staff roles in ascending order of clearance, starting from 1
+    __clearance_roles__ = 'helper', 'tmod', 'rmod', 'smod', 'hmod', 'senior', 'bot', 'admin'
+
     bot: CustomBot
 
     logging_channel_id: int | None
@@ -36,3 +44,38 @@ class MetaData:
     activity: str | None
     greeting: str | None
     appeal_url: str | None
+
+    # Minimum MEE6 level (as a string, Mongo keys must be) -> reward role ID
+    level_roles: dict[str, int] = field(default_factory=dict)
+
+    role_clearances: dict[int, int] = field(init=False, repr=False, compare=False)
+
+    automod_ignored_roles: frozenset[int] = field(init=False, repr=False, compare=False)
+    automod_ignored_channels: frozenset[int] = field(init=False, repr=False, compare=False)
+
+    domain_matcher: DomainMatcher = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        role_clearances = {}
+        for clearance, role in enumerate(self.__clearance_roles__, start=1):
+            role_id = getattr(self, f'{role}_role_id')
+            if role_id is not None:
+                role_clearances[role_id] = clearance
+
+        # Frozen dataclass; derived fields have to bypass `__setattr__`
+        object.__setattr__(self, 'role_clearances', role_clearances)
+
+        object.__setattr__(self, 'automod_ignored_roles', frozenset(self.automod_ignored_role_ids))
+        object.__setattr__(self, 'automod_ignored_channels', frozenset(self.automod_ignored_channel_ids))
+
+        object.__setattr__(self, 'domain_matcher', compile_domains(tuple(self.domain_bl), tuple(self.domain_wl)))
+
+    @staticmethod
+    def _is_ignored(message: Message, channels: frozenset[int], roles: frozenset[int], /) -> bool:
+        if message.channel.id in channels:
+            return True
+        # `Member.roles` builds and sorts a list, so only pay for it when there is something to compare against
+        return bool(roles) and not roles.isdisjoint(role.id for role in getattr(message.author, 'roles', ()))
+
+    def ignores_automod(self, message: Message, /) -> bool:
+        return self._is_ignored(message, self.automod_ignored_channels, self.automod_ignored_roles)
@@ -0,0 +1,187 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+from bisect import bisect_left
+from functools import wraps
+from logging import getLogger
+from time import perf_counter
+
+from aiohttp import web
+
+if TYPE_CHECKING:
+    from typing import Any, Self
+    from types import TracebackType
+    from collections.abc import Awaitable, Callable
+
+    Labels = tuple[tuple[str, str], ...]
+    Key = tuple[str, Labels]
+
+
+_logger = getLogger(__name__)
+
+
+class Histogram:
+
+    __slots__ = 'counts', 'total', 'count'
+
+    # Upper bounds in seconds; the final implicit bucket is +Inf
+    __buckets__ = 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+
+    def __init__(self) -> None:
+        self.counts: list[int] = [0] * (len(self.__buckets__) + 1)
+        self.total: float = 0.0
+        self.count: int = 0
+
+    def observe(self, value: float, /) -> None:
+        self.counts[bisect_left(self.__buckets__, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def quantile(self, q: float, /) -> float:
+        # Upper bound of the bucket containing the q-th observation; coarse but cheap
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.__buckets__, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float('inf')
+
+
+class Timer:
+
+    __slots__ = 'registry', 'name', 'labels', 'start'
+
+    def __init__(self, registry: MetricsRegistry, name: str, labels: dict[str, Any], /) -> None:
+        self.registry: MetricsRegistry = registry
+        self.name: str = name
+        self.labels: dict[str, Any] = labels
+        self.start: float = 0.0
+
+    def __enter__(self) -> Self:
+        self.start = perf_counter()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None
+    ) -> None:
+        self.registry.observe(self.name, perf_counter() - self.start, **self.labels)
+        if exc_type is not None:
+            self.registry.inc(f'{self.name.removesuffix("_seconds")}_errors_total', **self.labels)
+
+
+class MetricsRegistry:
+
+    def __init__(self) -> None:
+        self.counters: dict[Key, float] = {}
+        self.gauges: dict[Key, float] = {}
+        self.histograms: dict[Key, Histogram] = {}
+
+    @staticmethod
+    def key(name: str, labels: dict[str, Any], /) -> Key:
+        return name, tuple(sorted((label, str(value)) for label, value in labels.items()))
+
+    def inc(self, name: str, value: float = 1, /, **labels: Any) -> None:
+        key = self.key(name, labels)
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    def set(self, name: str, value: float, /, **labels: Any) -> None:
+        self.gauges[self.key(name, labels)] = value
+
+    def observe(self, name: str, value: float, /, **labels: Any) -> None:
+        key = self.key(name, labels)
+        try:
+            histogram = self.histograms[key]
+        except KeyError:
+            histogram = self.histograms[key] = Histogram()
+        histogram.observe(value)
+
+    def time(self, name: str, /, **labels: Any) -> Timer:
+        return Timer(self, name, labels)
+
+    @staticmethod
+    def escape_label(value: Any, /) -> str:
+        # Per the text exposition format; backslashes first, so the escapes added after them aren't doubled
+        return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+    @classmethod
+    def format_labels(cls, labels: Labels, /, **extra: str) -> str:
+        pairs = (*labels, *extra.items())
+        if not pairs:
+            return ''
+        escaped = (f'{label}="{cls.escape_label(value)}"' for label, value in pairs)
+        return '{' + ','.join(escaped) + '}'
+
+    def render_prometheus(self) -> str:
+        lines = []
+
+        for kind, metrics in ('counter', self.counters), ('gauge', self.gauges):
+            for name in sorted({name for name, _ in metrics}):
+                lines.append(f'# TYPE {name} {kind}')
+                for (metric, labels), value in metrics.items():
+                    if metric == name:
+                        lines.append(f'{name}{self.format_labels(labels)} {value}')
+
+        for name in sorted({name for name, _ in self.histograms}):
+            lines.append(f'# TYPE {name} histogram')
+            for (metric, labels), histogram in self.histograms.items():
+                if metric != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip((*Histogram.__buckets__, '+Inf'), histogram.counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{self.format_labels(labels, le=str(bound))} {cumulative}')
+                lines.append(f'{name}_sum{self.format_labels(labels)} {histogram.total}')
+                lines.append(f'{name}_count{self.format_labels(labels)} {histogram.count}')
+
+        return '\n'.join(lines) + '\n'
+
+
+def timed(name: str, /) -> Callable:
+    # Times a coroutine method of any object with a `bot` attribute, labelled by method name
+    def decorator(func: Callable[..., Awaitable[Any]], /) -> Callable[..., Awaitable[Any]]:
+        @wraps(func)
+        async def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+            with self.bot.metrics.time(name, method=func.__name__):
+                return await func(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class MetricsServer:
+
+    def __init__(self, registry: MetricsRegistry, port: int | None, /, *, host: str = '127.0.0.1') -> None:
+        self.registry: MetricsRegistry = registry
+        self.host: str = host
+        self.port: int | None = port
+
+        self.__runner: web.AppRunner | None = None
+
+    async def handle_metrics(self, _: web.Request, /) -> web.Response:
+        return web.Response(text=self.registry.render_prometheus(), content_type='text/plain', charset='utf-8')
+
+    async def __aenter__(self) -> Self:
+        if self.port is None:
+            return self
+
+        app = web.Application()
+        app.router.add_get('/metrics', self.handle_metrics)
+
+        self.__runner = web.AppRunner(app, access_log=None)
+        await self.__runner.setup()
+        await web.TCPSite(self.__runner, self.host, self.port).start()
+
+        _logger.info(f'Serving metrics on http://{self.host}:{self.port}/metrics')
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None
+    ) -> None:
+        if self.__runner is not None:
+            await self.__runner.cleanup()
@@ -2,9 +2,10 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 from dataclasses import dataclass
+from datetime import datetime, timezone
 
 if TYPE_CHECKING:
-    from datetime import datetime, timedelta
+    from datetime import timedelta
 
     from core.bot import CustomBot
 
@@ -37,3 +38,34 @@ class Modlog:
     @property
     def is_expired(self) -> bool:
         return self.until < self.bot.now
+
+
+@dataclass(kw_only=True, slots=True, frozen=True)
+class ExpiredModlog:
+
+    # The subset of modlog fields needed to lift an expired punishment
+
+    case_id: int
+    user_id: int
+
+    channel_id: int = 0
+
+    type: str
+
+
+@dataclass(kw_only=True, slots=True, frozen=True)
+class ActiveModlog:
+
+    # The subset of modlog fields needed to enforce an active punishment, as held by the local replica
+
+    case_id: int
+    user_id: int
+
+    channel_id: int = 0
+
+    type: str
+    expires_at: float
+
+    @property
+    def until(self) -> datetime:
+        return datetime.fromtimestamp(self.expires_at, tz=timezone.utc)
@@ -3,21 +3,37 @@ from typing import TYPE_CHECKING
 
 from logging import getLogger
 from datetime import timedelta
+from collections import deque, Counter
+from itertools import islice
+from asyncio import Event, Lock, create_task, gather, sleep
 
 from core.metadata import MetaData
-from core.modlog import Modlog
+from core.modlog import Modlog, ExpiredModlog
+from core.cache import ModlogCache
+from core.journal import ModlogJournal
+from core.metrics import timed
 from core.errors import ModlogNotFound
 
 from certifi import where
-from pymongo import ReturnDocument, DESCENDING
-from pymongo.errors import ConfigurationError, ServerSelectionTimeoutError
+from pymongo import ReturnDocument, ReplaceOne, UpdateOne, DeleteOne, IndexModel, ASCENDING, DESCENDING
+from pymongo.errors import (
+    ConfigurationError,
+    ServerSelectionTimeoutError,
+    OperationFailure,
+    BulkWriteError,
+    PyMongoError
+)
 from motor.motor_asyncio import AsyncIOMotorClient
 
 if TYPE_CHECKING:
     from typing import Self, Any
     from types import TracebackType
+    from datetime import datetime
+    from asyncio import Task
+    from collections.abc import Iterable, AsyncIterator
 
     from core.bot import CustomBot
+    from core.tracebacks import TracebackRecord
 
     from motor.motor_asyncio import AsyncIOMotorDatabase, AsyncIOMotorCollection, AsyncIOMotorClientSession
 
@@ -29,25 +45,99 @@ _logger = getLogger(__name__)
 
 class MongoDBClient:
 
-    def __init__(self, bot: CustomBot, uri: str, /) -> None:
+    # Number of case IDs reserved per round trip; unused IDs are handed back on a clean shutdown. The next block is
+    # reserved in the background once fewer than `__case_id_low__` remain, so new cases (which are journalled)
+    # don't depend on Mongo being reachable
+    __case_id_block__ = 500
+    __case_id_low__ = 100
+
+    # Journalled modlogs are written to Mongo in batches of up to `__flush_batch__`, after collecting inserts for
+    # `__flush_delay__` seconds; failed flushes are retried every `__flush_retry__` seconds
+    __flush_batch__ = 100
+    __flush_delay__ = 0.25
+    __flush_retry__ = 5
+
+    # Every index the access paths below rely on, keyed by collection
+    # `meta_data`, `counters` and `bans` are only ever queried on `_id` (or as a single document), so need none
+    __indexes__ = {
+        'modlogs': (
+            IndexModel([('case_id', ASCENDING)], unique=True),
+            IndexModel([('user_id', ASCENDING), ('active', ASCENDING), ('deleted', ASCENDING)]),
+            IndexModel([('user_id', ASCENDING), ('case_id', ASCENDING)]),
+            IndexModel([('active', ASCENDING), ('deleted', ASCENDING), ('expires_at', ASCENDING)]),
+            IndexModel([('updated', ASCENDING)])
+        ),
+        'levels': (
+            IndexModel([('active', ASCENDING), ('last_gain', ASCENDING)]),
+        ),
+        'modlog_rollups': (
+            IndexModel([('_id.day', ASCENDING)]),
+        )
+    }
+
+    # Representative query shapes (collection, filter, sort), checked against `__indexes__` by explain_queries.py
+    __query_shapes__ = {
+        'search_modlog(user_id, active, deleted)': (
+            'modlogs', {'user_id': 0, 'active': True, 'deleted': False}, None
+        ),
+        'search_modlog(active, deleted)': ('modlogs', {'active': True, 'deleted': False}, None),
+        'fetch_modlogs(active)': ('modlogs', {'active': True}, None),
+        'get_expired_modlogs': ('modlogs', {'active': True, 'deleted': False, 'expires_at': {'$lte': 0}}, None),
+        'search_modlog(case_id)': ('modlogs', {'case_id': 0}, None),
+        'update_modlog(_case_id)': ('modlogs', {'case_id': 0}, None),
+        'seed_modlog_counter': ('modlogs', {}, [('case_id', DESCENDING)]),
+        'get_modlog_changes': ('modlogs', {'updated': {'$gte': 0}}, [('updated', ASCENDING)]),
+        'get_modlog_rollups': ('modlog_rollups', {'_id.day': {'$gte': 0}}, None),
+        'get_lapsed_active_levels': ('levels', {'active': True, 'last_gain': {'$lt': 0}}, None),
+        'iter_modlogs(user_id, after)': ('modlogs', {'user_id': 0, 'case_id': {'$lt': 0}}, [('case_id', DESCENDING)])
+    }
+
+    def __init__(
+        self,
+        bot: CustomBot,
+        uri: str,
+        /, *,
+        database: str = 'database',
+        tls: bool = True,
+        journal: str | None = None
+    ) -> None:
         self.bot: CustomBot = bot
         self.uri: str = uri
 
+        # `tls=False` is only meant for local, throwaway deployments (scripts and benchmarks)
         try:
             self.client = AsyncIOMotorClient(
                 uri,
-                tlsCAFile=where(),
-                serverSelectionTimeoutMS=3000
+                serverSelectionTimeoutMS=3000,
+                **({'tlsCAFile': where()} if tls is True else {})
             )
         except ConfigurationError as error:
             _logger.fatal(error)
             _logger.fatal('Invalid Mongo connection URI provided. Please check your config.py file is correct.')
             raise SystemExit()
 
-        self.database: AsyncIOMotorDatabase = self.client.database
+        self.database: AsyncIOMotorDatabase = self.client[database]
 
         self.__session: AsyncIOMotorClientSession | None = None
 
+        self.cache: ModlogCache = ModlogCache()
+
+        self.__case_ids: deque[int] = deque()
+        self.__case_id_lock: Lock = Lock()
+        self.__case_id_refill: Task | None = None
+
+        # Rollups are only maintained by `$inc` from the point they were first built
+        self.rollups_built: bool = False
+
+        # Without a journal, modlogs are inserted inline
+        self.journal: ModlogJournal | None = ModlogJournal(journal) if journal is not None else None
+        self.__queue: dict[int, Dict] = {}
+        self.__queued: Event = Event()
+        # Case IDs inserted by a flush whose rollup hasn't been applied yet, so a retry still counts them
+        self.__unrolled: set[int] = set()
+        self.__flush_lock: Lock = Lock()
+        self.__writer: Task | None = None
+
     async def __aenter__(self) -> Self:
         try:
             self.__session = await self.client.start_session()
@@ -55,6 +145,12 @@ class MongoDBClient:
             _logger.fatal(error)
             _logger.fatal('Failed to connect to MongoDB. Please check your config.py file is correct.')
             raise SystemExit()
+
+        await gather(self.ensure_indexes(), self.seed_modlog_counter())
+        await self.reserve_modlog_ids()
+        # Before the journal is replayed, so replayed inserts are counted by the flush rather than the backfill
+        await self.ensure_rollups()
+        await self.open_journal()
         return self
 
     async def __aexit__(
@@ -63,13 +159,159 @@ class MongoDBClient:
         exc_val: BaseException | None,
         exc_tb: TracebackType | None
     ) -> None:
+        if self.__case_id_refill is not None:
+            self.__case_id_refill.cancel()
+
+        await self.close_journal()
+        try:
+            await self.release_modlog_ids()
+        except PyMongoError as error:
+            _logger.warning(f'Failed to release {len(self.__case_ids)} unused case ID(s) - {error}')
         await self.__session.end_session()
 
+    async def open_journal(self) -> None:
+        if self.journal is None:
+            return
+
+        # Replayed inserts are idempotent, case IDs acknowledged after the last ack was journalled already exist
+        replayed = self.journal.open()
+        if replayed:
+            _logger.info(f'Replaying {len(replayed)} unacknowledged modlog(s) from {self.journal.path}')
+            self.__queue.update((document['case_id'], document) for document in replayed)
+            await self.flush_modlogs()
+
+        self.__writer = create_task(self.write_behind())
+
+    async def close_journal(self) -> None:
+        if self.journal is None:
+            return
+
+        if self.__writer is not None:
+            self.__writer.cancel()
+            self.__writer = None
+
+        try:
+            await self.flush_modlogs()
+        except PyMongoError as error:
+            _logger.error(f'{len(self.__queue)} modlog(s) left in {self.journal.path} for the next start-up - {error}')
+
+        self.journal.close()
+
+    async def write_behind(self) -> None:
+        while True:
+            await self.__queued.wait()
+            # Let a burst of inserts accumulate into one batch
+            await sleep(self.__flush_delay__)
+
+            try:
+                await self.flush_modlogs()
+            except PyMongoError as error:
+                _logger.error(f'Failed to flush {len(self.__queue)} journalled modlog(s), retrying - {error}')
+                await sleep(self.__flush_retry__)
+                # The flush cleared the event before failing; re-arm it so the retry doesn't wait for a new insert
+                self.__queued.set()
+
+    @timed('mongo_operation_seconds')
+    async def flush_modlogs(self) -> None:
+        # Anything reading or updating modlogs in Mongo flushes first, so journalled modlogs are never missed
+        if not self.__queue:
+            return
+
+        collection: AsyncIOMotorCollection = self.database.modlogs
+
+        async with self.__flush_lock:
+            while self.__queue:
+                self.__queued.clear()
+                batch = list(islice(self.__queue.values(), self.__flush_batch__))
+
+                failed = set()
+                try:
+                    await collection.insert_many(batch, ordered=False, session=self.__session)
+                except BulkWriteError as error:
+                    # Duplicate case IDs were inserted before a crash or a failed flush; anything else never will be
+                    for write_error in error.details['writeErrors']:
+                        failed.add(write_error['index'])
+                        if write_error['code'] != 11000:
+                            _logger.error(f'Dropping journalled modlog - {write_error["errmsg"]}')
+
+                # Only modlogs inserted by a flush are counted, so replays don't count a case twice
+                self.__unrolled.update(
+                    document['case_id'] for index, document in enumerate(batch) if index not in failed
+                )
+                unrolled = [document for document in batch if document['case_id'] in self.__unrolled]
+                await self.rollup_modlogs(Counter(
+                    self.rollup_key(document) for document in unrolled if document['deleted'] is False
+                ))
+                self.__unrolled.difference_update(document['case_id'] for document in unrolled)
+
+                case_ids = [document['case_id'] for document in batch]
+                for case_id in case_ids:
+                    del self.__queue[case_id]
+
+                await self.journal.ack(case_ids)
+                self.bot.metrics.set('modlog_write_queue', len(self.__queue))
+
+            await self.journal.compact()
+
+    @staticmethod
+    def rollup_key(document: Dict, /) -> tuple[int, str, int]:
+        return document['created'] - document['created'] % 86400, document['type'], document['mod_id']
+
+    @timed('mongo_operation_seconds')
+    async def rollup_modlogs(self, changes: Counter[tuple[int, str, int]], /) -> None:
+        # Daily counts of non-deleted modlogs per type and moderator, moved by `$inc` as modlogs are written
+        requests = [
+            UpdateOne(
+                {'_id': {'day': day, 'type': log_type, 'mod_id': mod_id}},
+                {'$inc': {'count': delta}},
+                upsert=True
+            )
+            for (day, log_type, mod_id), delta in changes.items() if delta
+        ]
+        if not requests:
+            return
+
+        collection: AsyncIOMotorCollection = self.database.modlog_rollups
+        await collection.bulk_write(requests, ordered=False, session=self.__session)
+
+    @timed('mongo_operation_seconds')
+    async def get_modlog_rollups(self, since: int = 0, /) -> list[Dict]:
+        await self.flush_modlogs()
+        collection: AsyncIOMotorCollection = self.database.modlog_rollups
+        return [
+            entry async for entry in collection.find(
+                {'_id.day': {'$gte': since - since % 86400}, 'count': {'$gt': 0}},
+                session=self.__session
+            )
+        ]
+
     def prep_modlog_data(self, data: Dict, /) -> None:
         data['created'] = self.bot.dt_from_timestamp(data['created'])
         data['duration'] = timedelta(seconds=data['duration'])
         data.pop('_id', None)
-
+        data.pop('expires_at', None)
+        data.pop('updated', None)
+
+    @timed('mongo_operation_seconds')
+    async def ensure_indexes(self) -> None:
+        # `create_indexes` is a no-op for indexes that already exist with the same specification
+        # Each index is created on its own, so one that can't be built (e.g. a unique index over duplicates) doesn't
+        # leave the rest of the collection unindexed
+        for name, indexes in self.__indexes__.items():
+            collection: AsyncIOMotorCollection = self.database[name]
+            for index in indexes:
+                try:
+                    await collection.create_indexes([index], session=self.__session)
+                except OperationFailure as error:
+                    if error.code == 11000:
+                        _logger.error(
+                            f'Unique index {index.document["name"]} on collection {name} not created, documents '
+                            f'contain duplicates; run `python -m scripts.migrate case_ids` to resolve them - {error}'
+                        )
+                    else:
+                        _logger.error(f'Failed to create index {index.document["name"]} on {name} - {error}')
+
+    @timed('mongo_operation_seconds')
     async def get_metadata(self) -> MetaData:
         collection: AsyncIOMotorCollection = self.database.meta_data
         data: Dict | None = await collection.find_one({}, session=self.__session)
@@ -99,13 +341,16 @@ class MongoDBClient:
 
                 'activity': None,
                 'greeting': None,
-                'appeal_url': None
+                'appeal_url': None,
+
+                'level_roles': {}
             }
             await collection.insert_one(data, session=self.__session)
 
         data.pop('_id', None)
         return MetaData(bot=self.bot, **data)
 
+    @timed('mongo_operation_seconds')
     async def update_metadata(self, **kwargs: Any) -> None:
         collection: AsyncIOMotorCollection = self.database.meta_data
         data: Dict = await collection.find_one_and_update(
@@ -116,35 +361,204 @@ class MongoDBClient:
         )
         data.pop('_id', None)
         self.bot.metadata = MetaData(bot=self.bot, **data)
+        self.bot.invalidate_clearance()
+
+    @timed('mongo_operation_seconds')
+    async def get_bans(self) -> set[int]:
+        collection: AsyncIOMotorCollection = self.database.bans
+        return {entry['_id'] async for entry in collection.find({}, session=self.__session)}
+
+    @timed('mongo_operation_seconds')
+    async def add_ban(self, user_id: int, /) -> None:
+        collection: AsyncIOMotorCollection = self.database.bans
+        await collection.replace_one({'_id': user_id}, {'_id': user_id}, upsert=True, session=self.__session)
+
+    @timed('mongo_operation_seconds')
+    async def remove_ban(self, user_id: int, /) -> None:
+        collection: AsyncIOMotorCollection = self.database.bans
+        await collection.delete_one({'_id': user_id}, session=self.__session)
+
+    @timed('mongo_operation_seconds')
+    async def sync_bans(self, added: Iterable[int], removed: Iterable[int], /) -> None:
+        requests = [ReplaceOne({'_id': user_id}, {'_id': user_id}, upsert=True) for user_id in added]
+        requests.extend(DeleteOne({'_id': user_id}) for user_id in removed)
+
+        if requests:
+            collection: AsyncIOMotorCollection = self.database.bans
+            await collection.bulk_write(requests, ordered=False, session=self.__session)
+
+    @timed('mongo_operation_seconds')
+    async def get_checkpoint(self, name: str, /) -> Dict | None:
+        collection: AsyncIOMotorCollection = self.database.sync_state
+        return await collection.find_one({'_id': name}, session=self.__session)
+
+    @timed('mongo_operation_seconds')
+    async def set_checkpoint(self, name: str, /, **values: Any) -> None:
+        collection: AsyncIOMotorCollection = self.database.sync_state
+        await collection.update_one({'_id': name}, {'$set': values}, upsert=True, session=self.__session)
+
+    @timed('mongo_operation_seconds')
+    async def get_levels(self, user_ids: list[int], /) -> dict[int, Dict]:
+        collection: AsyncIOMotorCollection = self.database.levels
+        return {
+            entry['_id']: entry async for entry in collection.find({'_id': {'$in': user_ids}}, session=self.__session)
+        }
+
+    @timed('mongo_operation_seconds')
+    async def save_levels(self, entries: list[Dict], /) -> None:
+        if not entries:
+            return
+        collection: AsyncIOMotorCollection = self.database.levels
+        await collection.bulk_write(
+            [ReplaceOne({'_id': entry['_id']}, entry, upsert=True) for entry in entries],
+            ordered=False,
+            session=self.__session
+        )
 
-    async def generate_modlog_id(self) -> int:
+    @timed('mongo_operation_seconds')
+    async def get_lapsed_active_levels(self, cutoff: float, /) -> list[Dict]:
+        collection: AsyncIOMotorCollection = self.database.levels
+        return [
+            entry async for entry in collection.find(
+                {'active': True, 'last_gain': {'$lt': cutoff}},
+                session=self.__session
+            )
+        ]
+
+    @timed('mongo_operation_seconds')
+    async def get_traceback(self, fingerprint: str, /) -> Dict | None:
+        collection: AsyncIOMotorCollection = self.database.tracebacks
+        return await collection.find_one({'_id': fingerprint}, session=self.__session)
+
+    @timed('mongo_operation_seconds')
+    async def save_traceback(self, record: TracebackRecord, /, *, count: int) -> None:
+        # `count` is the number of occurrences since the record was last saved
+        collection: AsyncIOMotorCollection = self.database.tracebacks
+        await collection.update_one(
+            {'_id': record.fingerprint},
+            {
+                '$set': {'text': record.text, 'last_seen': record.last_seen},
+                '$min': {'first_seen': record.first_seen},
+                '$inc': {'count': count}
+            },
+            upsert=True,
+            session=self.__session
+        )
+
+    @timed('mongo_operation_seconds')
+    async def seed_modlog_counter(self) -> None:
+        # Idempotent migration; `$max` never moves the counter backwards, so this is safe to run on every start-up
         collection: AsyncIOMotorCollection = self.database.modlogs
         most_recent_modlog: Dict | None = await collection.find_one(
             sort=[('case_id', DESCENDING)],
+            projection={'case_id': True},
             session=self.__session
         )
-        return most_recent_modlog.get('case_id') + 1 if most_recent_modlog is not None else 1
+        highest_case_id = most_recent_modlog.get('case_id') if most_recent_modlog is not None else 0
 
-    async def insert_modlog(self, modlog: Modlog, /) -> None:
-        collection: AsyncIOMotorCollection = self.database.modlogs
-        await collection.insert_one(
-            {
-                'case_id': modlog.case_id,
-                'user_id': modlog.user_id,
-                'mod_id': modlog.mod_id,
-                'channel_id': modlog.channel_id,
-                'type': modlog.type,
-                'reason': modlog.reason,
-                'created': round(modlog.created.timestamp()),
-                'duration': modlog.duration.total_seconds(),
-                'received': modlog.received,
-                'deleted': modlog.deleted,
-                'active': modlog.active
-            },
+        await self.database.counters.update_one(
+            {'_id': 'case_id'},
+            {'$max': {'value': highest_case_id}},
+            upsert=True,
+            session=self.__session
+        )
+
+    @timed('mongo_operation_seconds')
+    async def reserve_modlog_ids(self) -> None:
+        collection: AsyncIOMotorCollection = self.database.counters
+        data: Dict = await collection.find_one_and_update(
+            {'_id': 'case_id'},
+            {'$inc': {'value': self.__case_id_block__}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+            session=self.__session
+        )
+        last_case_id = data.get('value')
+        self.__case_ids.extend(range(last_case_id - self.__case_id_block__ + 1, last_case_id + 1))
+
+    async def release_modlog_ids(self) -> None:
+        # Only possible while the unused IDs are the most recently reserved, i.e. nothing else reserved after them
+        if not self.__case_ids:
+            return
+
+        first, last = self.__case_ids[0], self.__case_ids[-1]
+        if last - first + 1 != len(self.__case_ids):
+            return
+
+        collection: AsyncIOMotorCollection = self.database.counters
+        await collection.update_one(
+            {'_id': 'case_id', 'value': last},
+            {'$set': {'value': first - 1}},
             session=self.__session
         )
+        self.__case_ids.clear()
+
+    async def refill_modlog_ids(self) -> None:
+        async with self.__case_id_lock:
+            if len(self.__case_ids) >= self.__case_id_low__:
+                return
+
+            try:
+                await self.reserve_modlog_ids()
+            except PyMongoError as error:
+                _logger.warning(f'Failed to reserve case IDs, {len(self.__case_ids)} left - {error}')
+
+    async def generate_modlog_id(self) -> int:
+        # Only waits on Mongo once the reserved IDs have run out entirely
+        if not self.__case_ids:
+            async with self.__case_id_lock:
+                if not self.__case_ids:
+                    await self.reserve_modlog_ids()
+        case_id = self.__case_ids.popleft()
+
+        if len(self.__case_ids) < self.__case_id_low__ and (
+            self.__case_id_refill is None or self.__case_id_refill.done()
+        ):
+            self.__case_id_refill = create_task(self.refill_modlog_ids())
+        return case_id
+
+    @timed('mongo_operation_seconds')
+    async def insert_modlog(self, modlog: Modlog, /) -> None:
+        collection: AsyncIOMotorCollection = self.database.modlogs
+        created = round(modlog.created.timestamp())
+        duration = modlog.duration.total_seconds()
+        document = {
+            'case_id': modlog.case_id,
+            'user_id': modlog.user_id,
+            'mod_id': modlog.mod_id,
+            'channel_id': modlog.channel_id,
+            'type': modlog.type,
+            'reason': modlog.reason,
+            'created': created,
+            'duration': duration,
+            'expires_at': created + duration,
+            'received': modlog.received,
+            'deleted': modlog.deleted,
+            'active': modlog.active,
+            'updated': self.bot.now.timestamp()
+        }
+
+        # The replica is written through immediately, so enforcement sees the case even before Mongo does
+        if self.bot.replica is not None:
+            self.bot.replica.apply([document])
+
+        if self.journal is None:
+            await collection.insert_one(document, session=self.__session)
+            if modlog.deleted is False:
+                await self.rollup_modlogs(Counter([self.rollup_key(document)]))
+        else:
+            # Durable once journalled; queued first so the journal can't be compacted from under it
+            self.__queue[modlog.case_id] = document
+            await self.journal.append(document)
+            self.__queued.set()
+            self.bot.metrics.set('modlog_write_queue', len(self.__queue))
+
+        self.cache.put(modlog)
+        if modlog.active is True and modlog.deleted is False:
+            self.bot.scheduler.schedule(modlog.case_id, document['expires_at'])
         _logger.info(f'New Modlog entry created - Case ID: {modlog.case_id}')
 
+    @timed('mongo_operation_seconds')
     async def update_modlog(self, **kwargs: Any) -> Modlog:
         # Kwargs with leading underscores are our search parameters
         # Kwargs without leading underscores are our values to update
@@ -157,23 +571,216 @@ class MongoDBClient:
             else:
                 update_dict[key] = value
 
+        updated = self.bot.now.timestamp()
+
+        if 'created' in update_dict or 'duration' in update_dict:
+            # Pipeline updates treat strings starting with `$` as field paths, so values are wrapped in `$literal`
+            update = [
+                {'$set': {key: {'$literal': value} for key, value in update_dict.items()} | {'updated': updated}},
+                {'$set': {'expires_at': {'$add': ['$created', '$duration']}}}
+            ]
+        else:
+            update = {'$set': update_dict | {'updated': updated}}
+
+        await self.flush_modlogs()
         collection: AsyncIOMotorCollection = self.database.modlogs
-        data: Dict | None = await collection.find_one_and_update(
+        previous: Dict | None = await collection.find_one_and_update(
             search_dict,
-            {'$set': update_dict},
-            return_document=ReturnDocument.AFTER,
+            update,
+            return_document=ReturnDocument.BEFORE,
             session=self.__session
         )
 
-        if data is None:
+        if previous is None:
             raise ModlogNotFound(**search_dict)
 
+        # The updated document is derived locally, so the rollups can be moved without a second round trip
+        data = previous | update_dict | {'updated': updated}
+        if 'created' in update_dict or 'duration' in update_dict:
+            data['expires_at'] = data['created'] + data['duration']
+
+        changes = Counter()
+        if previous['deleted'] is False:
+            changes[self.rollup_key(previous)] -= 1
+        if data['deleted'] is False:
+            changes[self.rollup_key(data)] += 1
+        await self.rollup_modlogs(changes)
+
         _logger.info(f'Updated existing modlog entry - Case ID: {data.get("case_id")} - Updated: {update_dict}')
 
+        if self.bot.replica is not None:
+            self.bot.replica.apply([data])
+
         self.prep_modlog_data(data)
-        return Modlog(bot=self.bot, **data)
+        modlog = Modlog(bot=self.bot, **data)
+
+        self.cache.put(modlog)
+        if modlog.active is True and modlog.deleted is False:
+            self.bot.scheduler.schedule(modlog.case_id, modlog.until.timestamp())
+        else:
+            self.bot.scheduler.unschedule(modlog.case_id)
+        return modlog
+
+    @timed('mongo_operation_seconds')
+    async def deactivate_modlogs(self, case_ids: list[int], /) -> None:
+        if not case_ids:
+            return
+
+        # Dropped from the replica and scheduler first, so cases lifted while Mongo is unreachable aren't lifted again
+        if self.bot.replica is not None:
+            self.bot.replica.discard(case_ids)
+        for case_id in case_ids:
+            self.bot.scheduler.unschedule(case_id)
+
+        await self.flush_modlogs()
+        collection: AsyncIOMotorCollection = self.database.modlogs
+        updated = self.bot.now.timestamp()
+        result = await collection.bulk_write(
+            [UpdateOne({'case_id': case_id}, {'$set': {'active': False, 'updated': updated}}) for case_id in case_ids],
+            ordered=False,
+            session=self.__session
+        )
 
-    async def search_modlog(self, **kwargs: Any) -> list[Modlog]:
+        for case_id in case_ids:
+            self.cache.update(case_id, active=False)
+
+        _logger.info(f'Deactivated {result.modified_count} modlog entry(s) - Case IDs: {case_ids}')
+
+    @timed('mongo_operation_seconds')
+    async def get_expired_modlogs(self, now: datetime | None = None, /) -> list[ExpiredModlog]:
+        await self.flush_modlogs()
+        collection: AsyncIOMotorCollection = self.database.modlogs
+        now = now or self.bot.now
+
+        return [
+            ExpiredModlog(**entry) async for entry in collection.find(
+                {'active': True, 'deleted': False, 'expires_at': {'$lte': now.timestamp()}},
+                projection={'_id': False, 'case_id': True, 'user_id': True, 'channel_id': True, 'type': True},
+                session=self.__session
+            )
+        ]
+
+    @timed('mongo_operation_seconds')
+    async def backfill_expires_at(self) -> int:
+        collection: AsyncIOMotorCollection = self.database.modlogs
+        result = await collection.update_many(
+            {'expires_at': {'$exists': False}},
+            [{'$set': {'expires_at': {'$add': ['$created', '$duration']}}}],
+            session=self.__session
+        )
+        return result.modified_count
+
+    @timed('mongo_operation_seconds')
+    async def resolve_duplicate_case_ids(self) -> int:
+        # Keeps the oldest document for each duplicated case ID and moves the others to newly allocated case IDs
+        collection: AsyncIOMotorCollection = self.database.modlogs
+        duplicates = await collection.aggregate(
+            [
+                {'$group': {'_id': '$case_id', 'ids': {'$push': '$_id'}, 'count': {'$sum': 1}}},
+                {'$match': {'count': {'$gt': 1}}}
+            ],
+            allowDiskUse=True,
+            session=self.__session
+        ).to_list(None)
+
+        moved = 0
+        for duplicate in duplicates:
+            for document_id in sorted(duplicate['ids'])[1:]:
+                case_id = await self.generate_modlog_id()
+                await collection.update_one(
+                    {'_id': document_id},
+                    {'$set': {'case_id': case_id, 'updated': self.bot.now.timestamp()}},
+                    session=self.__session
+                )
+                _logger.warning(f'Duplicate of case ID {duplicate["_id"]} (document {document_id}) moved to {case_id}')
+                moved += 1
+
+        if moved:
+            await self.ensure_indexes()
+        return moved
+
+    async def ensure_rollups(self) -> None:
+        # Deployments that predate the rollups are backfilled once; staff stats fall back to scanning modlogs meanwhile
+        marker: Dict | None = await self.database.counters.find_one({'_id': 'modlog_rollups'}, session=self.__session)
+        if marker is not None:
+            self.rollups_built = True
+            return
+
+        _logger.info('Modlog rollups have never been built, backfilling them from modlogs')
+        try:
+            await self.backfill_rollups()
+        except PyMongoError as error:
+            _logger.error(f'Failed to backfill modlog rollups, run `python -m scripts.migrate rollups` - {error}')
+
+    @timed('mongo_operation_seconds')
+    async def backfill_rollups(self) -> int:
+        # Rebuilds every rollup from scratch; `$out` swaps the collection in atomically and keeps its indexes
+        collection: AsyncIOMotorCollection = self.database.modlogs
+        await collection.aggregate(
+            [
+                {'$match': {'deleted': False}},
+                {'$group': {
+                    '_id': {
+                        'day': {'$subtract': ['$created', {'$mod': ['$created', 86400]}]},
+                        'type': '$type',
+                        'mod_id': '$mod_id'
+                    },
+                    'count': {'$sum': 1}
+                }},
+                {'$out': 'modlog_rollups'}
+            ],
+            session=self.__session
+        ).to_list(None)
+
+        await self.database.counters.update_one(
+            {'_id': 'modlog_rollups'},
+            {'$set': {'value': self.bot.now.timestamp()}},
+            upsert=True,
+            session=self.__session
+        )
+        self.rollups_built = True
+        return await self.database.modlog_rollups.estimated_document_count()
+
+    @timed('mongo_operation_seconds')
+    async def backfill_updated(self) -> int:
+        # Modlogs written before `updated` existed are only replicated by the full reload in `reconcile_modlogs`
+        collection: AsyncIOMotorCollection = self.database.modlogs
+        result = await collection.update_many(
+            {'updated': {'$exists': False}},
+            [{'$set': {'updated': '$created'}}],
+            session=self.__session
+        )
+        return result.modified_count
+
+    @timed('mongo_operation_seconds')
+    async def get_modlog_changes(self, since: float, /) -> list[Dict]:
+        await self.flush_modlogs()
+        collection: AsyncIOMotorCollection = self.database.modlogs
+        return [
+            entry async for entry in collection.find(
+                {'updated': {'$gte': since}},
+                projection={
+                    '_id': False,
+                    'case_id': True,
+                    'user_id': True,
+                    'channel_id': True,
+                    'type': True,
+                    'created': True,
+                    'duration': True,
+                    'expires_at': True,
+                    'active': True,
+                    'deleted': True,
+                    'updated': True
+                },
+                sort=[('updated', ASCENDING)],
+                session=self.__session
+            )
+        ]
+
+    @timed('mongo_operation_seconds')
+    async def fetch_modlogs(self, **kwargs: Any) -> list[Modlog]:
+        # Always goes to the database, bypassing the cache
+        await self.flush_modlogs()
         collection: AsyncIOMotorCollection = self.database.modlogs
         modlogs = []
 
@@ -185,6 +792,96 @@ class MongoDBClient:
 
             modlogs.append(modlog)
 
+        return modlogs
+
+    async def iter_modlog_documents(
+        self,
+        query: Dict,
+        /, *,
+        projection: Dict | None = None,
+        batch_size: int = 100,
+        limit: int = 0,
+        after: int | None = None,
+        descending: bool = False
+    ) -> AsyncIterator[Dict]:
+        # Keyset pagination; `after` is the last case ID seen, in whichever direction is being iterated
+        if after is not None:
+            keyset = {'case_id': {'$lt' if descending is True else '$gt': after}}
+            query = {'$and': [query, keyset]} if query else keyset
+
+        await self.flush_modlogs()
+        collection: AsyncIOMotorCollection = self.database.modlogs
+        cursor = collection.find(
+            query,
+            projection=projection,
+            sort=[('case_id', DESCENDING if descending is True else ASCENDING)],
+            batch_size=batch_size,
+            limit=limit,
+            session=self.__session
+        )
+
+        entry: Dict
+        async for entry in cursor:
+            yield entry
+
+    async def iter_modlogs(
+        self,
+        *,
+        batch_size: int = 100,
+        limit: int = 0,
+        after: int | None = None,
+        descending: bool = False,
+        **kwargs: Any
+    ) -> AsyncIterator[Modlog]:
+        async for entry in self.iter_modlog_documents(
+            kwargs,
+            batch_size=batch_size,
+            limit=limit,
+            after=after,
+            descending=descending
+        ):
+            self.prep_modlog_data(entry)
+            yield Modlog(bot=self.bot, **entry)
+
+    async def iter_modlog_fields(
+        self,
+        *fields: str,
+        batch_size: int = 1000,
+        limit: int = 0,
+        after: int | None = None,
+        descending: bool = False,
+        **kwargs: Any
+    ) -> AsyncIterator[Dict]:
+        # Yields raw documents containing only `case_id` and the requested fields, without any conversion
+        projection = {'_id': False, 'case_id': True} | {field: True for field in fields}
+
+        async for entry in self.iter_modlog_documents(
+            kwargs,
+            projection=projection,
+            batch_size=batch_size,
+            limit=limit,
+            after=after,
+            descending=descending
+        ):
+            yield entry
+
+    @timed('mongo_operation_seconds')
+    async def count_modlogs(self, **kwargs: Any) -> int:
+        await self.flush_modlogs()
+        collection: AsyncIOMotorCollection = self.database.modlogs
+        if not kwargs:
+            return await collection.estimated_document_count()
+        return await collection.count_documents(kwargs, session=self.__session)
+
+    @timed('mongo_operation_seconds')
+    async def search_modlog(self, **kwargs: Any) -> list[Modlog]:
+        modlogs = self.cache.search(**kwargs)
+
+        if modlogs is None:
+            modlogs = await self.fetch_modlogs(**kwargs)
+            for modlog in modlogs:
+                self.cache.put(modlog)
+
         if not modlogs:
             raise ModlogNotFound(**kwargs)
 
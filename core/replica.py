@@ -0,0 +1,128 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+from sqlite3 import connect
+
+from core.modlog import ActiveModlog, ExpiredModlog
+
+if TYPE_CHECKING:
+    from typing import Any
+    from collections.abc import Iterable
+    from sqlite3 import Connection
+
+    from core.modlog import Modlog
+
+    Dict = dict[str, Any]
+    Row = tuple[int, int, int, str, float]
+
+
+class ModlogReplica:
+
+    # Local SQLite copy of every active, non-deleted modlog. Enforcement reads from here, so punishments are still
+    # re-applied and lifted while Mongo is slow or unreachable.
+
+    __schema__ = (
+        'CREATE TABLE IF NOT EXISTS modlogs ('
+        'case_id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL, channel_id INTEGER NOT NULL, '
+        'type TEXT NOT NULL, expires_at REAL NOT NULL)',
+        'CREATE INDEX IF NOT EXISTS modlogs_user_id ON modlogs (user_id)',
+        'CREATE INDEX IF NOT EXISTS modlogs_expires_at ON modlogs (expires_at)',
+        'CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value REAL NOT NULL)'
+    )
+
+    def __init__(self, path: str, /) -> None:
+        self.path: str = path
+
+        self.__connection: Connection = connect(path)
+        self.__connection.execute('PRAGMA journal_mode=WAL')
+        self.__connection.execute('PRAGMA synchronous=NORMAL')
+        with self.__connection:
+            for statement in self.__schema__:
+                self.__connection.execute(statement)
+
+        # Every change to a modlog with an `updated` time before the watermark is replicated
+        self.watermark: float = self.get_state('watermark')
+        # When Mongo was last read successfully
+        self.synced_at: float = self.get_state('synced_at')
+
+    def __len__(self) -> int:
+        return self.__connection.execute('SELECT COUNT(*) FROM modlogs').fetchone()[0]
+
+    def close(self) -> None:
+        self.__connection.close()
+
+    def get_state(self, key: str, /) -> float:
+        row = self.__connection.execute('SELECT value FROM state WHERE key = ?', (key,)).fetchone()
+        return row[0] if row is not None else 0.0
+
+    def staleness(self, now: float, /) -> float:
+        return now - self.synced_at if self.synced_at else float('inf')
+
+    def mark_synced(self, *, watermark: float, synced_at: float) -> None:
+        self.watermark, self.synced_at = max(self.watermark, watermark), synced_at
+        with self.__connection:
+            self.__connection.executemany(
+                'INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)',
+                (('watermark', self.watermark), ('synced_at', self.synced_at))
+            )
+
+    @staticmethod
+    def document_row(document: Dict, /) -> Row:
+        # Documents written before `expires_at` was backfilled are resolved the way the migration would
+        expires_at = document.get('expires_at')
+        if expires_at is None:
+            expires_at = document['created'] + document['duration']
+
+        return (
+            document['case_id'],
+            document['user_id'],
+            document.get('channel_id', 0),
+            document['type'],
+            expires_at
+        )
+
+    def apply(self, documents: Iterable[Dict], /) -> None:
+        # Takes raw modlog documents; any no longer active (or deleted) are dropped from the replica
+        upserts, deletes = [], []
+        for document in documents:
+            if document['active'] is True and document['deleted'] is False:
+                upserts.append(self.document_row(document))
+            else:
+                deletes.append((document['case_id'],))
+
+        with self.__connection:
+            self.__connection.executemany('INSERT OR REPLACE INTO modlogs VALUES (?, ?, ?, ?, ?)', upserts)
+            self.__connection.executemany('DELETE FROM modlogs WHERE case_id = ?', deletes)
+
+    def discard(self, case_ids: Iterable[int], /) -> None:
+        with self.__connection:
+            self.__connection.executemany('DELETE FROM modlogs WHERE case_id = ?', ((case_id,) for case_id in case_ids))
+
+    def replace(self, modlogs: Iterable[Modlog], /) -> None:
+        rows = [
+            (modlog.case_id, modlog.user_id, modlog.channel_id, modlog.type, modlog.until.timestamp())
+            for modlog in modlogs if modlog.active is True and modlog.deleted is False
+        ]
+        with self.__connection:
+            self.__connection.execute('DELETE FROM modlogs')
+            self.__connection.executemany('INSERT INTO modlogs VALUES (?, ?, ?, ?, ?)', rows)
+
+    def for_user(self, user_id: int, /) -> list[ActiveModlog]:
+        return [
+            ActiveModlog(case_id=case_id, user_id=user_id, channel_id=channel_id, type=type_, expires_at=expires_at)
+            for case_id, _, channel_id, type_, expires_at in self.__connection.execute(
+                'SELECT * FROM modlogs WHERE user_id = ? ORDER BY case_id', (user_id,)
+            )
+        ]
+
+    def expiry(self, case_id: int, /) -> float | None:
+        row = self.__connection.execute('SELECT expires_at FROM modlogs WHERE case_id = ?', (case_id,)).fetchone()
+        return row[0] if row is not None else None
+
+    def expired(self, now: float, /) -> list[ExpiredModlog]:
+        return [
+            ExpiredModlog(case_id=case_id, user_id=user_id, channel_id=channel_id, type=type_)
+            for case_id, user_id, channel_id, type_ in self.__connection.execute(
+                'SELECT case_id, user_id, channel_id, type FROM modlogs WHERE expires_at <= ? ORDER BY case_id', (now,)
+            )
+        ]
@@ -0,0 +1,125 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+from dataclasses import dataclass, field
+from asyncio import create_task, current_task, get_running_loop, shield, sleep, wait
+from logging import getLogger
+
+from discord import Object
+
+if TYPE_CHECKING:
+    from asyncio import Future, Task
+
+    from core.bot import CustomBot
+
+    from discord import Member
+
+
+_logger = getLogger(__name__)
+
+
+@dataclass(slots=True)
+class PendingRoleEdit:
+
+    member: Member
+
+    # Roles the member is expected to have before this edit is applied
+    baseline: frozenset[int]
+    future: Future = field(default_factory=lambda: get_running_loop().create_future())
+    toggles: int = 0
+
+
+class RoleToggleCoalescer:
+
+    # A member's first toggle is applied straight away; toggles within `__window__` seconds of their last edit are
+    # collected until the window closes, so clicking through a menu costs a request per window rather than per click
+    __window__ = 1.0
+
+    def __init__(self, bot: CustomBot, /) -> None:
+        self.bot: CustomBot = bot
+
+        # Roles each member will have once all queued and in-flight edits are applied; dropped once idle
+        self._roles: dict[int, set[int]] = {}
+        self._pending: dict[int, PendingRoleEdit] = {}
+        self._flushing: dict[int, Task] = {}
+        # Event loop time each member's last edit started at; dropped once the window has passed
+        self._last_edit: dict[int, float] = {}
+
+        self.__tasks: set[Task] = set()
+
+    async def toggle(self, member: Member, role_id: int, /) -> bool:
+        # Returns whether the role was added; raises whatever the coalesced edit failed with
+        try:
+            roles = self._roles[member.id]
+        except KeyError:
+            roles = self._roles[member.id] = {role.id for role in member.roles if not role.is_default()}
+
+        added = role_id not in roles
+        if added is True:
+            roles.add(role_id)
+        else:
+            roles.discard(role_id)
+
+        try:
+            pending = self._pending[member.id]
+        except KeyError:
+            pending = self._pending[member.id] = PendingRoleEdit(member, frozenset(roles ^ {role_id}))
+
+            last_edit = self._last_edit.get(member.id)
+            delay = 0.0 if last_edit is None else max(last_edit + self.__window__ - get_running_loop().time(), 0.0)
+
+            task = create_task(self.flush(member.id, self._flushing.get(member.id), delay))
+            self.__tasks.add(task)
+            task.add_done_callback(self.__tasks.discard)
+
+        pending.toggles += 1
+        self.bot.metrics.inc('role_toggles_total')
+
+        # Shielded so one interaction giving up can't cancel the edit the others are waiting on
+        await shield(pending.future)
+        return added
+
+    async def flush(self, member_id: int, previous: Task | None, delay: float, /) -> None:
+        await sleep(delay)
+
+        # Edits for the same member are applied in order, toggles made meanwhile join the pending edit
+        if previous is not None:
+            await wait((previous,))
+
+        pending = self._pending.pop(member_id)
+        self._flushing[member_id] = current_task()
+        roles = frozenset(self._roles[member_id])
+
+        loop = get_running_loop()
+        self._last_edit[member_id] = started = loop.time()
+        loop.call_later(self.__window__, self._expire, member_id, started)
+
+        try:
+            # Toggles that cancel out within the window need no request at all
+            if roles != pending.baseline:
+                await pending.member.edit(roles=[Object(id=role_id) for role_id in roles], reason='Role menu')
+                self.bot.metrics.inc('role_edits_total')
+        except Exception as error:
+            _logger.error(f'Failed to apply {pending.toggles} role toggle(s) for member {member_id} - {error}')
+            pending.future.set_exception(error)
+
+            # The expected roles no longer match the member's; toggles queued since are replayed onto their actual
+            # roles, otherwise the member cache is used from the next toggle on
+            queued = self._pending.get(member_id)
+            if queued is None:
+                self._roles.pop(member_id, None)
+            else:
+                actual = frozenset(role.id for role in pending.member.roles if not role.is_default())
+                self._roles[member_id] = set(actual ^ (self._roles[member_id] ^ queued.baseline))
+                queued.baseline = actual
+        else:
+            pending.future.set_result(None)
+        finally:
+            if self._flushing.get(member_id) is current_task():
+                del self._flushing[member_id]
+            if member_id not in self._pending and member_id not in self._flushing:
+                self._roles.pop(member_id, None)
+
+    def _expire(self, member_id: int, started: float, /) -> None:
+        if self._last_edit.get(member_id) == started:
+            del self._last_edit[member_id]
@@ -0,0 +1,118 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+from asyncio import Event, TimeoutError, wait_for
+from heapq import heapify, heappush, heappop
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from core.bot import CustomBot
+
+
+class ExpiryScheduler:
+
+    # Upper bound (in seconds) on a single sleep, so a skewed clock can never leave the scheduler dormant for long
+    __max_sleep__ = 3600
+
+    def __init__(self, bot: CustomBot, /) -> None:
+        self.bot: CustomBot = bot
+
+        # Expiries are the stored `expires_at` values, so they agree exactly with what the replica reports as expired
+        # Heap entries are invalidated lazily; an entry is only live while it matches `self._entries`
+        self._heap: list[tuple[float, int]] = []
+        self._entries: dict[int, float] = {}
+
+        self._touched: set[int] | None = None
+        self._wakeup: Event = Event()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, case_id: int, /) -> bool:
+        return case_id in self._entries
+
+    @property
+    def next_expiry(self) -> float | None:
+        while self._heap:
+            expiry, case_id = self._heap[0]
+            if self._entries.get(case_id) == expiry:
+                return expiry
+            heappop(self._heap)
+
+    def _compact(self) -> None:
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._heap = [(expiry, case_id) for case_id, expiry in self._entries.items()]
+            heapify(self._heap)
+
+    def schedule(self, case_id: int, expiry: float, /) -> None:
+        if self._touched is not None:
+            self._touched.add(case_id)
+
+        current = self._entries.get(case_id)
+        self._entries[case_id] = expiry
+
+        if current == expiry:
+            return
+
+        heappush(self._heap, (expiry, case_id))
+        self._compact()
+
+        if self.next_expiry == expiry:
+            self._wakeup.set()
+
+    def unschedule(self, case_id: int, /) -> None:
+        if self._touched is not None:
+            self._touched.add(case_id)
+
+        if self._entries.pop(case_id, None) is not None:
+            self._compact()
+
+    def begin_reload(self) -> None:
+        # Anything (un)scheduled between here and `load` is newer than the snapshot being fetched, so it is kept as-is
+        self._touched = set()
+
+    def load(self, expiries: Iterable[tuple[int, float]], /) -> None:
+        # Takes the (case ID, expiry) of every active, non-deleted modlog
+        touched = self._touched or set()
+        self._touched = None
+
+        entries = {case_id: expiry for case_id, expiry in self._entries.items() if case_id in touched}
+        for case_id, expiry in expiries:
+            if case_id not in touched:
+                entries[case_id] = expiry
+
+        self._entries = entries
+        self._heap = [(expiry, case_id) for case_id, expiry in entries.items()]
+        heapify(self._heap)
+
+        self._wakeup.set()
+
+    def overdue(self, now: float, /) -> list[int]:
+        # Takes every case due at `now` off the heap, skipping invalidated entries; the caller re-arms any it doesn't
+        # lift, so each wake costs O(k log n) for k due cases
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            expiry, case_id = heappop(self._heap)
+            if self._entries.get(case_id) != expiry:
+                continue
+
+            del self._entries[case_id]
+            if self._touched is not None:
+                self._touched.add(case_id)
+            due.append(case_id)
+        return due
+
+    async def wait(self) -> None:
+        self._wakeup.clear()
+
+        expiry = self.next_expiry
+        if expiry is None:
+            timeout = self.__max_sleep__
+        else:
+            timeout = min(max(expiry - self.bot.now.timestamp(), 0), self.__max_sleep__)
+
+        try:
+            await wait_for(self._wakeup.wait(), timeout)
+        except TimeoutError:
+            pass
@@ -0,0 +1,120 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+from dataclasses import dataclass
+from collections import OrderedDict
+from hashlib import blake2b
+from traceback import extract_tb, format_exception
+from logging import getLogger
+from asyncio import create_task
+
+if TYPE_CHECKING:
+    from asyncio import Task
+
+    from core.bot import CustomBot
+
+
+_logger = getLogger(__name__)
+
+
+@dataclass(slots=True)
+class TracebackRecord:
+
+    fingerprint: str
+    text: str
+
+    first_seen: float
+    last_seen: float
+    count: int = 1
+
+    # Occurrences not yet saved to Mongo
+    unsaved: int = 1
+
+
+class TracebackStore:
+
+    # Distinct tracebacks kept in memory. With `spill` enabled, each is saved to Mongo when first seen, and its
+    # counters again when evicted, so buttons keep working after eviction or a restart
+    __max_entries__ = 256
+
+    # Discord message content limit, less the code block and heading
+    __max_length__ = 1960
+
+    def __init__(self, bot: CustomBot, /, *, spill: bool = True) -> None:
+        self.bot: CustomBot = bot
+        self.spill: bool = spill
+
+        self._records: OrderedDict[str, TracebackRecord] = OrderedDict()
+        self.__spills: set[Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    @staticmethod
+    def fingerprint(error: BaseException, /) -> str:
+        # Identical failures share a fingerprint regardless of the message, which often embeds IDs or user input
+        error = getattr(error, 'original', error)
+        frames = (f'{frame.filename}:{frame.lineno}:{frame.name}' for frame in extract_tb(error.__traceback__))
+        key = '\n'.join((type(error).__qualname__, *frames))
+        return blake2b(key.encode(), digest_size=6).hexdigest()
+
+    def format(self, error: BaseException, /) -> str:
+        traceback = ''.join(format_exception(type(error), error, error.__traceback__))
+        if len(traceback) > self.__max_length__:
+            traceback = '\n'.join(traceback[-self.__max_length__:].split('\n')[1:])
+            note = ' (Last 2,000)'
+        else:
+            note = ''
+        return f'**Traceback{note}:**\n```\n{traceback}\n```'
+
+    def record(self, error: BaseException, /) -> TracebackRecord:
+        fingerprint = self.fingerprint(error)
+        now = self.bot.now.timestamp()
+
+        self.bot.metrics.inc('tracebacks_total')
+
+        try:
+            record = self._records[fingerprint]
+        except KeyError:
+            # Only the first occurrence is formatted; repeats just bump the counters
+            record = self._records[fingerprint] = TracebackRecord(fingerprint, self.format(error), now, now)
+            self.bot.metrics.inc('tracebacks_distinct_total')
+            self.spill_record(record)
+
+            if len(self._records) > self.__max_entries__:
+                _, evicted = self._records.popitem(last=False)
+                if evicted.unsaved:
+                    self.spill_record(evicted)
+        else:
+            record.count += 1
+            record.unsaved += 1
+            record.last_seen = now
+            self._records.move_to_end(fingerprint)
+
+        return record
+
+    def spill_record(self, record: TracebackRecord, /) -> None:
+        if self.spill is False or self.bot.mongo is None:
+            return
+
+        task = create_task(self.bot.mongo.save_traceback(record, count=record.unsaved))
+        record.unsaved = 0
+        self.__spills.add(task)
+        task.add_done_callback(self.__spilled)
+
+    def __spilled(self, task: Task, /) -> None:
+        self.__spills.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            _logger.error(f'Failed to spill traceback to Mongo - {task.exception()}')
+
+    async def get(self, fingerprint: str, /) -> str | None:
+        try:
+            return self._records[fingerprint].text
+        except KeyError:
+            pass
+
+        if self.spill is False or self.bot.mongo is None:
+            return None
+
+        document = await self.bot.mongo.get_traceback(fingerprint)
+        return document['text'] if document is not None else None
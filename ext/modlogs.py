@@ -1,16 +1,151 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING
 
+from core.analytics import ModlogAnalytics
+from core.embed import EmbedField
+from components.paginator import Paginator, ModlogPageSource
+
 from discord.ext import commands
+from discord import Colour, User
 
 if TYPE_CHECKING:
     from core.bot import CustomBot, CustomContext
+    from core.modlog import Modlog
 
 
 class ModlogsCommands(commands.Cog):
 
-    ...
+    def __init__(self, bot: CustomBot, /) -> None:
+        self.analytics: ModlogAnalytics = ModlogAnalytics(bot)
+
+    @staticmethod
+    async def send_fields(ctx: CustomContext, fields: list[EmbedField], /, *, title: str, description: str) -> None:
+        embeds = ctx.bot.fields_to_embeds(
+            fields,
+            title=title,
+            colour=Colour.blue(),
+            description=description,
+            author_name=ctx.bot.user.name,
+            author_icon=ctx.bot.user.avatar
+        )
+
+        message = await ctx.send(embed=embeds[0])
+        await message.edit(view=Paginator(ctx.author, message, embeds))
+
+    @staticmethod
+    def modlog_field(modlog: Modlog, /) -> EmbedField:
+        # Reasons are capped so a full page stays within Discord's total embed size
+        reason = modlog.reason if len(modlog.reason) <= 500 else f'{modlog.reason[:499]}…'
+        status = ' (deleted)' if modlog.deleted is True else ' (active)' if modlog.active is True else ''
+        return EmbedField(
+            name=f'Case {modlog.case_id} - {modlog.type}{status}',
+            value=f'<@{modlog.mod_id}> <t:{round(modlog.created.timestamp())}:R> - {reason}',
+            inline=False
+        )
+
+    @staticmethod
+    def since(ctx: CustomContext, days: int, /) -> int:
+        return round(ctx.bot.now.timestamp()) - days * 86400 if days > 0 else 0
+
+    @staticmethod
+    def period(days: int, /) -> str:
+        return f'over the last {days} day(s)' if days > 0 else 'of all time'
+
+    @commands.command(
+        name='modlogs',
+        aliases=['history'],
+        description='Shows the modlog history of a user, most recent first.',
+        extras={'requirement': 4}
+    )
+    async def modlogs(self, ctx: CustomContext, user: User) -> None:
+        # Pages are fetched as they're viewed, so a long history costs no more to open than a short one
+        source = await ModlogPageSource.create(
+            ctx.bot,
+            self.modlog_field,
+            embed_kwargs={
+                'title': f'Modlogs for {user}',
+                'colour': Colour.blue(),
+                'author_name': ctx.bot.user.name,
+                'author_icon': ctx.bot.user.avatar
+            },
+            user_id=user.id
+        )
+
+        message = await ctx.send(embed=await source.get_page(1))
+        await message.edit(view=Paginator(ctx.author, message, source))
+
+    @commands.command(
+        name='modstats',
+        aliases=['ms'],
+        description='Shows how many modlogs each moderator has created, optionally over the last `days` days.',
+        extras={'requirement': 4}
+    )
+    async def modstats(self, ctx: CustomContext, days: int = 0) -> None:
+        counts = await self.analytics.moderator_counts(since=self.since(ctx, days))
+        total = sum(count for _, count in counts)
+
+        fields = [
+            EmbedField(name=f'#{rank}', value=f'<@{mod_id}> - `{count}` case(s)', inline=False)
+            for rank, (mod_id, count) in enumerate(counts, start=1)
+        ]
+        await self.send_fields(
+            ctx,
+            fields,
+            title='Moderator Activity',
+            description=f'`{total}` case(s) by `{len(counts)}` moderator(s) {self.period(days)}.'
+        )
+
+    @commands.command(
+        name='dailystats',
+        aliases=['ds'],
+        description='Shows the number of modlogs of each type per day over the last `days` days.',
+        extras={'requirement': 4}
+    )
+    async def dailystats(self, ctx: CustomContext, days: int = 30) -> None:
+        daily_counts = await self.analytics.daily_type_counts(since=self.since(ctx, days))
+
+        fields = [
+            EmbedField(
+                name=f'<t:{day_start}:D>',
+                value=' - '.join(f'{log_type} `{count}`' for log_type, count in sorted(counts.items())),
+                inline=False
+            )
+            for day_start, counts in reversed(daily_counts.items())
+        ]
+        total = sum(counts.total() for counts in daily_counts.values())
+
+        await self.send_fields(
+            ctx,
+            fields,
+            title='Daily Modlogs',
+            description=f'`{total}` case(s) across `{len(daily_counts)}` day(s) {self.period(days)}.'
+        )
+
+    @commands.command(
+        name='offenders',
+        aliases=['repeat'],
+        description='Ranks users with at least `minimum` modlogs by case count, optionally over the last `days` days.',
+        extras={'requirement': 4}
+    )
+    async def offenders(self, ctx: CustomContext, minimum: int = 2, days: int = 0) -> None:
+        columns = await self.analytics.columns()
+        offenders = columns.repeat_offenders(minimum=max(minimum, 1), since=self.since(ctx, days))
+
+        fields = [
+            EmbedField(
+                name=f'#{rank}',
+                value=f'<@{user_id}> (`{user_id}`) - `{count}` case(s), last <t:{latest}:R>',
+                inline=False
+            )
+            for rank, (user_id, count, latest) in enumerate(offenders, start=1)
+        ]
+        await self.send_fields(
+            ctx,
+            fields,
+            title='Repeat Offenders',
+            description=f'`{len(offenders)}` user(s) with `{minimum}`+ case(s) {self.period(days)}.'
+        )
 
 
 async def setup(bot: CustomBot, /) -> None:
-    await bot.add_cog(ModlogsCommands())
+    await bot.add_cog(ModlogsCommands(bot))
@@ -0,0 +1,58 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+from core.embed import EmbedField
+from components.paginator import Paginator
+
+from discord.ext import commands
+from discord import Colour
+
+if TYPE_CHECKING:
+    from core.bot import CustomBot, CustomContext
+    from core.metrics import MetricsRegistry
+
+
+class StatsCommands(commands.Cog):
+
+    @staticmethod
+    def metric_fields(metrics: MetricsRegistry, /) -> list[EmbedField]:
+        fields = []
+
+        for (name, labels), histogram in sorted(metrics.histograms.items()):
+            label = ', '.join(value for _, value in labels)
+            mean = histogram.total / histogram.count * 1000
+            p50, p99 = histogram.quantile(0.5) * 1000, histogram.quantile(0.99) * 1000
+            fields.append(EmbedField(
+                name=f'{name} ({label})' if label else name,
+                value=f'`{histogram.count}` calls - mean `{mean:.1f}ms` - p50 ≤ `{p50:g}ms` - p99 ≤ `{p99:g}ms`',
+                inline=False
+            ))
+
+        for (name, labels), value in sorted((*metrics.counters.items(), *metrics.gauges.items())):
+            label = ', '.join(value for _, value in labels)
+            fields.append(EmbedField(name=f'{name} ({label})' if label else name, value=f'`{value:g}`', inline=False))
+
+        return fields
+
+    @commands.command(
+        name='metrics',
+        aliases=['perf'],
+        description='Shows latency and call counts for commands, database operations and Discord requests.',
+        extras={'requirement': 9}
+    )
+    async def metrics(self, ctx: CustomContext) -> None:
+        embeds = ctx.bot.fields_to_embeds(
+            self.metric_fields(ctx.bot.metrics),
+            title='Runtime Metrics',
+            colour=Colour.blue(),
+            description=f'Since <t:{round(ctx.bot.start_time.timestamp())}:R>.',
+            author_name=ctx.bot.user.name,
+            author_icon=ctx.bot.user.avatar
+        )
+
+        message = await ctx.send(embed=embeds[0])
+        await message.edit(view=Paginator(ctx.author, message, embeds))
+
+
+async def setup(bot: CustomBot, /) -> None:
+    await bot.add_cog(StatsCommands())
@@ -3,7 +3,10 @@ __all__ = (
     'GUILD_ID',
     'PREFIX',
     'TOKEN',
-    'MONGO'
+    'MONGO',
+    'METRICS_PORT',
+    'MODLOG_JOURNAL',
+    'MODLOG_REPLICA'
 )
 
 OWNER_IDS = {}
@@ -11,3 +14,6 @@ GUILD_ID = 0
 PREFIX = ''
 TOKEN = ''
 MONGO = ''
+METRICS_PORT = None  # Local Prometheus endpoint, disabled when None
+MODLOG_JOURNAL = 'modlogs.journal'  # Local write-behind journal for new modlogs, inserted inline when None
+MODLOG_REPLICA = 'modlogs.sqlite3'  # Local replica of active modlogs, read by enforcement
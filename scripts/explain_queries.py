@@ -0,0 +1,62 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+from argparse import ArgumentParser
+from asyncio import run
+from logging import basicConfig, WARNING
+
+from core.bot import CustomBot
+from core.mongo import MongoDBClient
+
+if TYPE_CHECKING:
+    from typing import Any
+    from collections.abc import Iterator
+
+
+# Usage: python -m scripts.explain_queries [--uri mongodb://localhost:27017] [--database database]
+# Ensures indexes, then explains every query shape declared on `MongoDBClient`; exits non-zero on any COLLSCAN.
+
+
+def plan_stages(plan: Any, /) -> Iterator[str]:
+    if isinstance(plan, dict):
+        if 'stage' in plan:
+            yield plan['stage']
+        for value in plan.values():
+            yield from plan_stages(value)
+    elif isinstance(plan, list):
+        for value in plan:
+            yield from plan_stages(value)
+
+
+async def main(uri: str, database: str, tls: bool, /) -> int:
+    client = MongoDBClient(CustomBot(), uri, database=database, tls=tls)
+
+    failures = 0
+
+    async with client:
+        for name, (collection, query, sort) in client.__query_shapes__.items():
+            cursor = client.database[collection].find(query).limit(1)
+            if sort is not None:
+                cursor = cursor.sort(sort)
+
+            explanation = await cursor.explain()
+            stages = list(plan_stages(explanation['queryPlanner']['winningPlan']))
+
+            status = 'FAIL' if 'COLLSCAN' in stages else 'ok'
+            failures += status == 'FAIL'
+            print(f'[{status:>4}] {name}: {" <- ".join(stages)}')
+
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+
+    basicConfig(level=WARNING)
+
+    parser = ArgumentParser(description='Verify that every modlog query shape is served by an index.')
+    parser.add_argument('--uri', default='mongodb://localhost:27017')
+    parser.add_argument('--database', default='database')
+    parser.add_argument('--tls', action='store_true', help='Connect with TLS (required for hosted clusters).')
+    args = parser.parse_args()
+
+    raise SystemExit(run(main(args.uri, args.database, args.tls)))
@@ -0,0 +1,47 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+from argparse import ArgumentParser
+from asyncio import run
+from logging import basicConfig, INFO
+
+from core.bot import CustomBot
+from core.mongo import MongoDBClient
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+
+# Usage: python -m scripts.migrate [--uri ...] [--database database] <migration> [<migration> ...]
+# Every migration is idempotent and safe to re-run.
+
+
+MIGRATIONS: dict[str, Callable[[MongoDBClient], Awaitable[int]]] = {
+    'case_ids': MongoDBClient.resolve_duplicate_case_ids,
+    'expires_at': MongoDBClient.backfill_expires_at,
+    'updated': MongoDBClient.backfill_updated,
+    'rollups': MongoDBClient.backfill_rollups
+}
+
+
+async def main(uri: str, database: str, migrations: list[str], tls: bool, /) -> None:
+    client = MongoDBClient(CustomBot(), uri, database=database, tls=tls)
+
+    async with client:
+        for name in migrations:
+            count = await MIGRATIONS[name](client)
+            print(f'{name}: {count} document(s) updated')
+
+
+if __name__ == '__main__':
+
+    basicConfig(level=INFO)
+
+    parser = ArgumentParser(description='Run one-off data migrations against the bot\'s database.')
+    parser.add_argument('--uri', default='mongodb://localhost:27017')
+    parser.add_argument('--database', default='database')
+    parser.add_argument('migrations', nargs='+', choices=MIGRATIONS)
+    parser.add_argument('--tls', action='store_true', help='Connect with TLS (required for hosted clusters).')
+    args = parser.parse_args()
+
+    run(main(args.uri, args.database, args.migrations, args.tls))
@@ -0,0 +1,86 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+from argparse import ArgumentParser
+from asyncio import gather, run
+from logging import basicConfig, WARNING
+
+from core.bot import CustomBot, CustomContext
+from core.mongo import MongoDBClient
+
+if TYPE_CHECKING:
+    from core.modlog import Modlog
+
+
+# Usage: python -m scripts.stress_case_ids [--uri mongodb://localhost:27017] [--processes 4] [--calls 500]
+# Runs against a scratch database on a local mongod, which is dropped afterwards.
+
+
+def warn() -> None:
+    ...
+
+
+class StressCommand:
+
+    callback = warn
+
+
+class StressAuthor:
+
+    id = 0
+
+
+class StressContext:
+
+    __enduring_log_types__ = CustomContext.__enduring_log_types__
+
+    to_modlog = CustomContext.to_modlog
+
+    def __init__(self, bot: CustomBot, /) -> None:
+        self.bot: CustomBot = bot
+        self.author: StressAuthor = StressAuthor()
+        self.command: StressCommand = StressCommand()
+
+
+async def moderate(ctx: StressContext, user_id: int, /) -> int:
+    modlog: Modlog = await ctx.to_modlog(user_id, reason='Stress test.')
+    await ctx.bot.mongo.insert_modlog(modlog)
+    return modlog.case_id
+
+
+async def main(uri: str, database: str, processes: int, calls: int, tls: bool, /) -> int:
+    bots = [CustomBot() for _ in range(processes)]
+    clients = [MongoDBClient(bot, uri, database=database, tls=tls) for bot in bots]
+
+    await clients[0].client.drop_database(database)
+
+    for bot, client in zip(bots, clients):
+        bot.mongo = await client.__aenter__()
+
+    try:
+        case_ids = await gather(*(
+            moderate(StressContext(bots[n % processes]), n) for n in range(calls)
+        ))
+    finally:
+        await clients[0].client.drop_database(database)
+        for client in clients:
+            await client.__aexit__(None, None, None)
+
+    duplicates = len(case_ids) - len(set(case_ids))
+    print(f'{len(case_ids)} case IDs allocated across {processes} client(s), {duplicates} duplicate(s).')
+    return 1 if duplicates else 0
+
+
+if __name__ == '__main__':
+
+    basicConfig(level=WARNING)
+
+    parser = ArgumentParser(description='Allocate case IDs concurrently and check for duplicates.')
+    parser.add_argument('--uri', default='mongodb://localhost:27017')
+    parser.add_argument('--database', default='stress_case_ids')
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--calls', type=int, default=500)
+    parser.add_argument('--tls', action='store_true', help='Connect with TLS (required for hosted clusters).')
+    args = parser.parse_args()
+
+    raise SystemExit(run(main(args.uri, args.database, args.processes, args.calls, args.tls)))